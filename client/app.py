@@ -16,27 +16,27 @@ import shutil
 import tarfile
 import smtplib
 import threading
-from uuid import uuid4
 
 import pandas as pd
 import requests
 from flask import Flask, jsonify, make_response, request, render_template, redirect, url_for, send_from_directory, g
 from flask_login import LoginManager, UserMixin, current_user, login_required, login_user, logout_user
 from sqlalchemy import select
-from werkzeug.security import check_password_hash
 from werkzeug.utils import secure_filename
 
 from client.db_utils import query_term_id, rebuild_electropherogram_and_bp_translation, save_data
 from database.config import SessionLocal
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, configure_mappers
 from database.config import engine
 from database.schema.file import File
 from database.schema.submission import Submission, DeleteStatus
 from database.schema.user_details import UserDetails
+from database.schema.uuid7 import uuid7
 from .src.client_constants import UPLOAD_FOLDER, DOWNLOAD_FOLDER, MAX_CONT_LEN, EXAMPLE_TABLE, EXAMPLE_LADDER, \
     EXAMPLE_META, LADDER_DICT, STATIC_DIR, REPORT_COLUMNS, VM1_API_URL, VM1_CERT_PATH
 from .src.errors import secure_error
-from .src.tools import allowed_file, file2pdf, input2dnavi, get_result_files, move_dnavi_files
+from .src.tools import allowed_file, archive_pending, build_archive, claim_archive, file2pdf, \
+    input2dnavi, get_result_files, move_dnavi_files, release_archive
 from .src.users_saving import get_username, save_user
 
 ###############################################################################
@@ -73,6 +73,9 @@ app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['DOWNLOAD_FOLDER'] = DOWNLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONT_LEN
 login_manager.init_app(app)
+# Resolve all ORM relationships now (database.schema imports every mapped class),
+# instead of during the first request that runs a query
+configure_mappers()
 
 class User(UserMixin):
     pass
@@ -98,8 +101,7 @@ def request_loader(request):
     db.close()
     if not user_record:
         return None
-    from werkzeug.security import check_password_hash
-    if check_password_hash(user_record.password_hash, password):
+    if user_record.check_password(password):
         user = User()
         user.id = user_record.username
         return user
@@ -124,7 +126,7 @@ def login():
     user_record = db.query(UserDetails).filter_by(username=username).first()
     db.close()
     # If record exists and password is correct Log in
-    if user_record and check_password_hash(user_record.password_hash, password):
+    if user_record and user_record.check_password(password):
         print("SUCCESS LOGGING IN")
         user = User()
         user.id = user_record.username
@@ -335,7 +337,8 @@ def protect():
         ######################################################################
         # UNIQUE ID, CREATE PROCESSING DIRECTORY,SAVE FILES TEMPORARLY (VM2) #
         ######################################################################
-        request_id = str(uuid4())
+        # Time-ordered: the request id becomes the submission_id primary key
+        request_id = str(uuid7())
         processing_folder = f"{app.config['UPLOAD_FOLDER']}{username}/{request_id}/"
         os.makedirs(processing_folder, exist_ok=True)
         f = f"{processing_folder}{secure_filename(data_inpt)}"
@@ -555,17 +558,37 @@ def download(submission_id):
     # Check if zip exists
     if os.path.isfile(zip_path):
         return send_from_directory(directory, zip_filename, as_attachment=True)
-    # Zip missing -> file was delted from temporary storage
-    # rebuild local folder with missing files from DB (file system files already
-    # loaded during results page retrieval)
-    electro_path, bp_path = rebuild_electropherogram_and_bp_translation(submission_id, submission_folder)
-    if not electro_path or not bp_path:
-        logging.error(f"Failed to rebuild required CSVs for submission {submission_id}. ZIP not created.")
-    # Create zip and send
-    shutil.make_archive(zip_path.replace(".zip", ""), 'zip', submission_folder)
-    logging.info(f"Created zip for submission {submission_id} at {zip_path}")
+    # Zip may still be built in the background right after the analysis, by
+    # this or another worker: answer right away and let the client retry
+    if not claim_archive(zip_path):
+        return jsonify({'error': 'The download is still being prepared, please try again shortly'}), \
+            503, {'Retry-After': '5'}
+    try:
+        # The background job may have finished since the first check
+        if not os.path.isfile(zip_path):
+            # Zip missing -> file was delted from temporary storage
+            # rebuild local folder with missing files from DB (file system files already
+            # loaded during results page retrieval)
+            electro_path, bp_path = rebuild_electropherogram_and_bp_translation(submission_id, submission_folder)
+            if not electro_path or not bp_path:
+                logging.error(f"Failed to rebuild required CSVs for submission {submission_id}. ZIP not created.")
+            # Create zip (under a temporary name, renamed when complete) and send
+            build_archive(zip_path.replace(".zip", ""), submission_folder)
+            logging.info(f"Created zip for submission {submission_id} at {zip_path}")
+    finally:
+        release_archive(zip_path)
     return send_from_directory(directory, zip_filename, as_attachment=True)
 
+@app.route('/download/<submission_id>/status', methods=['GET'])
+def download_status(submission_id):
+    """
+    Lets the results page poll whether the zip for download is ready.
+    """
+    username = get_username()
+    zip_path = os.path.join(f"{app.config['DOWNLOAD_FOLDER']}{username}/",
+                            f"{submission_id}_compressed.zip")
+    return jsonify({'ready': os.path.isfile(zip_path) and not archive_pending(zip_path)})
+
 @app.template_filter('datetimeformat')
 def datetimeformat(value):
     return datetime.datetime.fromtimestamp(value).strftime('%b %d, %Y')
@@ -10,12 +10,12 @@ import math
 import os
 from pathlib import Path
 import re
-import uuid
+import threading
 
 import chardet
 import pandas as pd
 import requests
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
@@ -27,10 +27,12 @@ from database.schema.ladder_peak import LadderPeak
 from database.schema.ladder_pixel import LadderPixel
 from database.schema.ontology_term import OntologyTerm
 from database.schema.sample import Sample
-from database.schema.sample_pixel import SamplePixel
+from database.schema.sample_pixel_trace import SamplePixelTrace
 from database.schema.subject import Subject
 from database.schema.submission import Submission
 from database.schema.user_details import UserDetails
+from database.schema.uuid7 import uuid7
+from database.seed import ONTOLOGY_TERM_ROWS, SEX_INFO_ROWS
 from .src.client_constants import VM1_API_URL, VM1_CERT_PATH
 from .src.tools import get_all_files_except_saved_in_db
 
@@ -253,7 +255,6 @@ def save_file_paths_to_db(session, submission_id, saved_files_paths):
         # Save each file path
         for path in saved_files_paths:
             file_record = File(
-                file_id=uuid.uuid4(),
                 submission_id=submission_id,
                 file_name=os.path.basename(path),
                 relative_path=path
@@ -286,12 +287,14 @@ def save_ladder(session, ladder_path):
     session.add(new_ladder)
     # Must flush because the ladder peaks depend on autoincrement value ladder_id
     session.flush()
-    # Insert ladder peaks
+    # Insert ladder peaks, keyed by their row in the file; the markers are flagged
     peaks = [
         LadderPeak(ladder_id=new_ladder.ladder_id,
-                   peak=row["Peak"],
+                   peak_order=peak_order,
+                   is_upper_marker=str(row["Peak"]).strip().lower() == "upper_marker",
+                   is_lower_marker=str(row["Peak"]).strip().lower() == "lower_marker",
                    basepairs=float(row["Basepairs"]))
-        for _, row in ladder_df.iterrows()
+        for peak_order, (_, row) in enumerate(ladder_df.iterrows())
     ]
     session.add_all(peaks)
     logging.info("Saved ladder %s as ladder_id %s", ladder_name, new_ladder.ladder_id)
@@ -312,15 +315,15 @@ def save_ladder_pixel(session, signal_table_path, bp_translation_path, ladder_id
     bp_positions = bp_translation['Ladder'].values
     n = max(len(bp_positions), len(pixel_intensities))
     ladder_pixels = [
-        LadderPixel(
-            ladder_id=ladder_id,
-            pixel_order=i,
-            pixel_intensity=to_decimal_safe(pixel_intensities[i]) if pd.notnull(pixel_intensities[i]) else None, 
-            base_pair_position=to_decimal_safe(bp_positions[i]) if pd.notnull(bp_positions[i]) else None
-        )
+        {
+            "ladder_id": ladder_id,
+            "pixel_order": i,
+            "pixel_intensity": to_decimal_safe(pixel_intensities[i]) if pd.notnull(pixel_intensities[i]) else None,
+            "base_pair_position": to_decimal_safe(bp_positions[i]) if pd.notnull(bp_positions[i]) else None
+        }
         for i in range(n)
     ]
-    session.add_all(ladder_pixels)
+    LadderPixel.bulk_insert(session, ladder_pixels)
     logging.info("Saved ladder pixels successfully.")
 
 
@@ -350,6 +353,89 @@ def normalize_nullable(value):
 ##############################################################################
 #                           SAVE ONTOLOGY TERMS                              #
 ##############################################################################
+# Same pattern as the ck_term_id_curie constraint of ontology_term: terms that would
+# fail it are skipped here instead of failing the whole save. Compiled once; the
+# pattern has no nested quantifiers, so matching is linear in the length of the id.
+CURIE_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_.-]*:[A-Za-z0-9_.-]+")
+
+# Built once and reused for every batch of new ontology terms
+ONTOLOGY_TERM_INSERT = (
+    insert(OntologyTerm)
+    .values(term_id=bindparam("term_id"), term_label=bindparam("term_label"))
+    .on_conflict_do_nothing(index_elements=["term_id"])
+)
+
+# Ontology terms are reference data (never updated), so the term_id of a label
+# is cached per process: {lowercase term_label: term_id}.
+# The cache is shared by concurrent saves, so it is only accessed under TERM_CACHE_LOCK.
+# Entries read inside a save's transaction may belong to terms inserted by that
+# (still uncommitted) save: they are staged on the session and only published to the
+# cache after the commit (publish_term_caches), a rolled back save publishes nothing.
+TERM_ID_CACHE = {}
+TERM_ID_CACHE_SIZE = 8192
+# Same for the key samples reference: {term_id: term_pk}
+TERM_PK_CACHE = {}
+TERM_CACHE_LOCK = threading.Lock()
+TERM_CACHES = {"term_id": TERM_ID_CACHE, "term_pk": TERM_PK_CACHE}
+
+def cached_terms(session, cache_name, keys):
+    """
+    Return {key: value} for the keys found in the cache cache_name (see TERM_CACHES)
+    or staged on session by this save.
+    """
+    staged = session.info.get("staged_terms", {}).get(cache_name, {})
+    cache = TERM_CACHES[cache_name]
+    found = {}
+    with TERM_CACHE_LOCK:
+        for key in keys:
+            value = cache.get(key)
+            if value is not None:
+                found[key] = value
+    for key in keys:
+        if key not in found and key in staged:
+            found[key] = staged[key]
+    return found
+
+def stage_terms(session, cache_name, entries):
+    """
+    Remember entries read in the session's transaction, they are added
+    to the cache cache_name by publish_term_caches after the commit.
+    """
+    session.info.setdefault("staged_terms", {}).setdefault(cache_name, {}).update(entries)
+
+def publish_term_caches(session):
+    """
+    Add the entries staged on session to the term caches, call after session.commit().
+    """
+    staged_terms = session.info.pop("staged_terms", {})
+    with TERM_CACHE_LOCK:
+        for cache_name, entries in staged_terms.items():
+            cache = TERM_CACHES[cache_name]
+            if len(cache) + len(entries) > TERM_ID_CACHE_SIZE:
+                cache.clear()
+            cache.update(entries)
+
+def fetch_term_ids(session, labels):
+    """
+    Return the term_ids of the ontology terms with the given labels (case-insensitive).
+    Labels not in TERM_ID_CACHE are loaded in one IN query and staged for the cache.
+    Returns {lowercase term_label: term_id}, labels not in the database are missing.
+    """
+    lower_labels = {label.lower() for label in labels if label}
+    found = cached_terms(session, "term_id", lower_labels)
+    missing = lower_labels - found.keys()
+    if missing:
+        rows = session.execute(
+            select(OntologyTerm.term_label, OntologyTerm.term_id)
+            .where(OntologyTerm.term_label.in_(missing))
+        )
+        loaded = {}
+        for term_label, term_id in rows:
+            loaded.setdefault(term_label.lower(), term_id)
+        stage_terms(session, "term_id", loaded)
+        found.update(loaded)
+    return found
+
 def save_ontology_terms(session, metadata_path):
     """
     Save all ontology terms inside the metadata file to the database.
@@ -364,33 +450,37 @@ def save_ontology_terms(session, metadata_path):
         "Infection Strain"
     ]
     ontology_label_to_id = {col: {} for col in ontology_term_fields}
+    new_terms = []
+    new_term_ids = {}
+    labels_by_col = {
+        label_col: [extract_label(str(raw_value).strip()) for raw_value in meta_df[label_col].dropna()]
+        for label_col in ontology_term_fields if label_col in meta_df.columns
+    }
+    # All labels already in the DB, looked up at once
+    existing_term_ids = fetch_term_ids(session, {label for labels in labels_by_col.values() for label in labels})
     # Loop through each ontology terms column in metadata
-    for label_col in ontology_term_fields:
-        if label_col not in meta_df.columns:
-            continue
-        for raw_value in meta_df[label_col].dropna():
-            input_value = str(raw_value).strip()
-            label = extract_label(input_value)
+    for label_col, labels in labels_by_col.items():
+        for label in labels:
+            # Term queued for insert earlier in this file
+            if label.lower() in new_term_ids:
+                ontology_label_to_id[label_col][label] = new_term_ids[label.lower()]
+                continue
             # If this label already exists in DB do not save
-            exists = session.query(OntologyTerm).filter(
-                func.lower(OntologyTerm.term_label) == label.lower()
-            ).first()
-            if exists:
-                term_id = exists.term_id
+            term_id = existing_term_ids.get(label.lower())
             # New label -> Store to DB only if we have a valid label
-            else:
+            if not term_id:
                 # Get term ID from OLS
                 term_id = get_ols_term_id(label, label_col)
-                if not term_id or not term_id.lower().startswith(get_ontology_prefix(label_col)):  # None or empty string or term_id not from the ontology
+                if (not term_id or not term_id.lower().startswith(get_ontology_prefix(label_col))
+                        or not CURIE_RE.fullmatch(term_id)):  # None or empty string, term_id not from the ontology or not a CURIE
                     #term_id = str(uuid.uuid4())
                     continue
-                stmt = (
-                    insert(OntologyTerm)
-                    .values(term_id=term_id, term_label=label)
-                    .on_conflict_do_nothing(index_elements=["term_id"])
-                )
-                session.execute(stmt)
+                new_terms.append({"term_id": term_id, "term_label": label})
+                new_term_ids[label.lower()] = term_id
             ontology_label_to_id[label_col][label] = term_id
+    # One executemany of the prebuilt statement for all new terms
+    if new_terms:
+        session.execute(ONTOLOGY_TERM_INSERT, new_terms)
     logging.info("Ontology terms saved successfully.")
     return ontology_label_to_id
 
@@ -408,24 +498,34 @@ def save_devices(session, metadata_path):
     if "Gel Electrophoresis Device" not in meta_df.columns:
         return
     device_name_to_id = {col_name: {}}
+    # Distinct names, compared case-insensitively like the stored devices
+    device_names = {}
     for raw_device in meta_df[col_name].dropna():
-        devices_names = [d.strip() for d in str(raw_device).split(";") if d.strip()]
-        for device_name in devices_names:
-            # Check if device already exists
-            exists = session.query(GelElectrophoresisDevice).filter(
-                func.lower(GelElectrophoresisDevice.device_name) == device_name.lower()
-            ).first()
-            if exists:
-                device_id = exists.device_id
-            else:
-                stmt = (
-                    insert(GelElectrophoresisDevice)
-                    .values(device_name=device_name)
-                    .returning(GelElectrophoresisDevice.device_id)
-                )
-                result = session.execute(stmt)
-                device_id = result.scalar()
-            device_name_to_id[col_name][device_name] = device_id
+        for device_name in (d.strip() for d in str(raw_device).split(";")):
+            if device_name:
+                device_names.setdefault(device_name.lower(), []).append(device_name)
+    if not device_names:
+        return device_name_to_id
+    # One SELECT for the devices already stored
+    lower_name = func.lower(GelElectrophoresisDevice.device_name)
+    lookup = select(GelElectrophoresisDevice.device_id, lower_name).where(lower_name.in_(list(device_names)))
+    device_ids = {key: device_id for device_id, key in session.execute(lookup)}
+    # One INSERT ... ON CONFLICT DO NOTHING for all new devices, spelled as first seen
+    missing = [{"device_name": names[0]} for key, names in device_names.items() if key not in device_ids]
+    if missing:
+        stmt = (
+            insert(GelElectrophoresisDevice)
+            .on_conflict_do_nothing(index_elements=["device_name"])
+            .returning(GelElectrophoresisDevice.device_id, GelElectrophoresisDevice.device_name)
+        )
+        for device_id, device_name in session.execute(stmt, missing):
+            device_ids[device_name.lower()] = device_id
+        # Inserted concurrently by another submission: skipped above, read them back
+        if len(device_ids) < len(device_names):
+            device_ids.update((key, device_id) for device_id, key in session.execute(lookup))
+    for key, names in device_names.items():
+        for device_name in names:
+            device_name_to_id[col_name][device_name] = device_ids.get(key)
     logging.info("Device terms saved successfully.")
     return device_name_to_id
 
@@ -446,19 +546,19 @@ def save_subjects(session, metadata_path, ontology_label_to_id):
     meta_df = pd.read_csv(metadata_path, encoding=metadata_encoding)
     seen_subjects = {}
     sample_to_subject_id = {}
+    ethnicity_term_ids = {}
+    if "Ethnicity" in meta_df.columns:
+        ethnicity_term_ids = fetch_term_ids(session, {extract_label(str(value).strip())
+                                                      for value in meta_df["Ethnicity"].dropna()})
     for _, row in meta_df.iterrows():
         subject_name = get_clean_value(row, "Subject ID")
         sample_value = get_clean_value(row, "SAMPLE")
-        biological_sex = get_clean_value(row, "Biological Sex")
+        biological_sex_term_id = map_biological_sex(get_clean_value(row, "Biological Sex"))
         ethnicity_label =  extract_label(get_clean_value(row, "Ethnicity"))
         ethnicity_term_id = None
         # Map ethnicity label to term_id
         if ethnicity_label:
-            term = session.query(OntologyTerm)\
-                .filter(func.lower(OntologyTerm.term_label) == ethnicity_label.lower())\
-                .first()
-            if term:
-                ethnicity_term_id = term.term_id
+            ethnicity_term_id = ethnicity_term_ids.get(ethnicity_label.lower())
         # Determine if we need to insert
         if subject_name:
             key = subject_name.lower()
@@ -466,9 +566,9 @@ def save_subjects(session, metadata_path, ontology_label_to_id):
                 subject_id = seen_subjects[key]
             else:
                 new_subject = Subject(
-                    subject_id=uuid.uuid4(),
+                    subject_id=uuid7(),
                     subject_name=subject_name,
-                    biological_sex=biological_sex,
+                    biological_sex_term_id=biological_sex_term_id,
                     ethnicity_term_id=ethnicity_term_id,
                     organism_term_id = map_term("Organism", extract_label(row.get("Organism")), ontology_label_to_id)
                 )
@@ -479,9 +579,9 @@ def save_subjects(session, metadata_path, ontology_label_to_id):
         # No subject name found -> create new unique subject id and None name
         else:
             new_subject = Subject(
-                subject_id=uuid.uuid4(),
+                subject_id=uuid7(),
                 subject_name=None,
-                biological_sex=biological_sex,
+                biological_sex_term_id=biological_sex_term_id,
                 ethnicity_term_id=ethnicity_term_id,
                 organism_term_id = map_term("Organism", extract_label(row.get("Organism")), ontology_label_to_id)
             )
@@ -520,6 +620,21 @@ def is_valid_metadata(metadata_path, expected_sample_count):
         return False
     return True
 
+# Biological sex label (male, female, ...) -> term id in biological_sex_info
+SEX_TERM_IDS = {term_id for term_id, in SEX_INFO_ROWS}
+BIOLOGICAL_SEX_TO_TERM_ID = {term_label: term_id
+                             for term_label, term_id, _ in ONTOLOGY_TERM_ROWS
+                             if term_id in SEX_TERM_IDS}
+
+def map_biological_sex(label):
+    """
+    Return the ontology term_id of a biological sex label (i.e. female -> PATO:0000383),
+    None if the label is empty or not one of the seeded biological sex terms.
+    """
+    if label is None:
+        return None
+    return BIOLOGICAL_SEX_TO_TERM_ID.get(label.strip().lower())
+
 def map_term(col_name, label, label_to_id):
     """
     Return the term_id according to OLS of the label (i.e. Cancer) 
@@ -534,6 +649,27 @@ def map_term(col_name, label, label_to_id):
         key = label
     return label_to_id.get(col_name, {}).get(key, None)
 
+def get_term_pks(session, ontology_label_to_id):
+    """
+    Return {term_id: term_pk} for all term_ids in ontology_label_to_id
+    (samples reference ontology terms by term_pk).
+    term_ids not in TERM_PK_CACHE are looked up with one IN query and staged for the cache
+    (the terms may have been inserted by this, still uncommitted, save).
+    """
+    term_ids = {term_id for label_to_id in ontology_label_to_id.values()
+                for term_id in label_to_id.values()}
+    found = cached_terms(session, "term_pk", term_ids)
+    missing = term_ids - found.keys()
+    if missing:
+        rows = session.execute(
+            select(OntologyTerm.term_id, OntologyTerm.term_pk)
+            .where(OntologyTerm.term_id.in_(missing))
+        )
+        loaded = dict(rows.all())
+        stage_terms(session, "term_pk", loaded)
+        found.update(loaded)
+    return found
+
 def yes_no_to_bool(val):
     """
     This method is for the boolean answers we receive from frontend.
@@ -548,6 +684,26 @@ def yes_no_to_bool(val):
         return False
     return None
 
+# Range of the SMALLINT age_at_collection_months column
+AGE_MONTHS_RANGE = (0, 32767)
+
+def age_to_months(age):
+    """
+    Convert the age in years from the metadata into whole months for age_at_collection_months.
+    Ages that are not a number or out of the column's range (AGE_MONTHS_RANGE)
+    are stored as None with a warning instead of failing the whole save.
+    """
+    if pd.isna(age):
+        return None
+    try:
+        months = round(float(age) * 12)
+    except (TypeError, ValueError, OverflowError):
+        months = None
+    if months is not None and AGE_MONTHS_RANGE[0] <= months <= AGE_MONTHS_RANGE[1]:
+        return months
+    logging.warning("Ignoring invalid age %r, stored as empty.", age)
+    return None
+
 ##############################################################################
 #                                 SAVE SAMPLE                                #
 ##############################################################################
@@ -585,7 +741,10 @@ def save_samples(session, signal_table_path, metadata_path, submission_id,
         "Carrying Liquid Volume", "Carrying Liquid Volume Unit", "Gel Electrophoresis Device",
         "In vitro / In vivo", "Treatment", "Ethnicity", "Biological Sex", "Organism", "Actions"
     ]
-    sample_ids_in_order = []
+    term_pks = get_term_pks(session, ontology_label_to_id)
+    def map_term_pk(col, label):
+        return term_pks.get(map_term(col, label, ontology_label_to_id))
+    sample_rows = []
     for i, col_name in enumerate(signal_sample_names):
         # Pick sample name from metadata if available
         sample_name = sample_names[i] if i < len(sample_names) else col_name
@@ -601,18 +760,18 @@ def save_samples(session, signal_table_path, metadata_path, submission_id,
             subject_id = sample_to_subject_id.get(str(sample_name).strip()) if sample_name else None
             sample_data.update({
                 "subject_id": subject_id,
-                "disease_term_id": map_term("Disease", extract_label(row.get("Disease")), ontology_label_to_id),
-                "phenotypic_abnormality_term_id": map_term("Phenotypic Feature", extract_label(row.get("Phenotypic Feature")), ontology_label_to_id),
-                "treatment_term_id": map_term("Treatment", extract_label(row.get("Treatment")), ontology_label_to_id),
-                "cell_type_term_id": map_term("Cell Type", extract_label(row.get("Cell Type")), ontology_label_to_id),
+                "disease_term_pk": map_term_pk("Disease", extract_label(row.get("Disease"))),
+                "phenotypic_abnormality_term_pk": map_term_pk("Phenotypic Feature", extract_label(row.get("Phenotypic Feature"))),
+                "treatment_term_pk": map_term_pk("Treatment", extract_label(row.get("Treatment"))),
+                "cell_type_term_pk": map_term_pk("Cell Type", extract_label(row.get("Cell Type"))),
                 "sample_type": normalize_nullable(row.get("Sample Type")),
                 "sample_collection_date": (datetime.strptime(row.get("Sample Collection Date"), "%Y-%m-%d").date() 
                            if pd.notnull(row.get("Sample Collection Date")) and re.match(r"\d{4}-\d{2}-\d{2}$", str(row.get("Sample Collection Date"))) 
                            else None),
-                "age_at_collection": float(row.get("Age")) if pd.notnull(row.get("Age")) else None,
-                "sampling_site_term_id": map_term("Material Anatomical Entity", extract_label(row.get("Material Anatomical Entity")), ontology_label_to_id),
+                "age_at_collection_months": age_to_months(row.get("Age")),
+                "sampling_site_term_pk": map_term_pk("Material Anatomical Entity", extract_label(row.get("Material Anatomical Entity"))),
                 "case_vs_control": normalize_nullable(row.get("Case vs Control")),
-                "condition_under_study_term_id": map_term("Condition Under Study", extract_label(row.get("Condition Under Study")), ontology_label_to_id),
+                "condition_under_study_term_pk": map_term_pk("Condition Under Study", extract_label(row.get("Condition Under Study"))),
                 "is_deceased": yes_no_to_bool(row.get("Is Deceased?")),
                 "is_pregnant": yes_no_to_bool(row.get("Is Pregnant?")),
                 "is_infection_suspected": yes_no_to_bool(row.get("Is Infection Suspected?")),
@@ -633,13 +792,11 @@ def save_samples(session, signal_table_path, metadata_path, submission_id,
                     val = row[col]
                     if pd.notnull(val):
                         custom_attributes[col] = val
-            if custom_attributes:
-                sample_data["custom_sample_attributes"] = custom_attributes
-        sample = Sample(**sample_data)
-        # Save sample
-        session.add(sample)
-        session.flush()  # ensure sample_id is populated
-        sample_ids_in_order.append(sample.sample_id)
+            # Always set, so all rows have the same keys (one insert batch)
+            sample_data["custom_sample_attributes"] = custom_attributes or None
+        sample_rows.append(sample_data)
+    # Save all samples at once, the sample_ids come back in row order
+    sample_ids_in_order = Sample.bulk_insert(session, sample_rows)
     logging.info("Saved %d samples successfully.", len(sample_ids_in_order))
     return sample_ids_in_order
 
@@ -648,6 +805,12 @@ def to_decimal_safe(value):
         return Decimal(value)
     except (InvalidOperation, TypeError, ValueError):
         return None
+
+def to_float_safe(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
     
 ##############################################################################
 #                                 SAVE SAMPLE PIXEL                          #
@@ -668,22 +831,25 @@ def save_sample_pixel(session, signal_table_path, bp_translation_path, sample_id
     bp_translation = pd.read_csv(bp_translation_path, encoding=bp_translation_encoding, dtype=str).iloc[:, 2:] # remove first two col 
     if signal_table.shape[1] != len(sample_ids_in_order):
         raise ValueError(f"Number of samples in signal table {signal_table.shape[1]} does not match provided sample IDs {len(sample_ids_in_order)}.")
-    # Loop over samples
+    # One trace row per sample, the pixel order is the position in the arrays
+    traces = []
     for i, sample_id in enumerate(sample_ids_in_order):
         pixel_intensities = signal_table.iloc[:, i].values
         bp_positions = bp_translation.iloc[:, i].values
         n = max(len(bp_positions), len(pixel_intensities))
-        sample_pixels = [
-            SamplePixel(
-                sample_id=sample_id,
-                pixel_order=j,
-                pixel_intensity=to_decimal_safe(pixel_intensities[j]) if pd.notnull(pixel_intensities[j]) else None, 
-                base_pair_position = to_decimal_safe(bp_positions[j]) if pd.notnull(bp_positions[j]) else None
-            )
-            for j in range(n)
-        ]
-        session.add_all(sample_pixels)
-    logging.info("Saved %d sample pixels successfully.", len(sample_ids_in_order))
+        traces.append({
+            "sample_id": sample_id,
+            "pixel_intensity": [
+                to_float_safe(pixel_intensities[j]) if j < len(pixel_intensities) and pd.notnull(pixel_intensities[j]) else None
+                for j in range(n)
+            ],
+            "base_pair_position": [
+                to_float_safe(bp_positions[j]) if j < len(bp_positions) and pd.notnull(bp_positions[j]) else None
+                for j in range(n)
+            ]
+        })
+    SamplePixelTrace.bulk_insert(session, traces)
+    logging.info("Saved %d sample pixel traces successfully.", len(traces))
 
 ##############################################################################
 #                          SAVE ANALYSIS TO DB                               #                 
@@ -717,6 +883,8 @@ def save_data_to_db(submission_id, username, signal_table_path, bp_translation_p
             save_sample_pixel(session, signal_table_path, bp_translation_path, sample_ids_in_order)
             # Commit all together to ensure all or nothing writes (Atomicity)
             session.commit()
+            # Only committed terms go into the shared caches
+            publish_term_caches(session)
             logging.info("Saved all data to database successfully!")
     except Exception as e:
         logging.info("Error saving files to database: %s", e)
@@ -765,6 +933,33 @@ def save_data(app, submission_id, username, save_to_db):
     ladder_path = os.path.join(submission_folder, f"electropherogram_ladder.csv")
     save_data_to_db(submission_id, username, signal_table_path, bp_translation_path, ladder_path, metadata_path, saved_files_paths)
 
+# Built once: the statements are constructed (and compiled) only at the first call,
+# later calls only bind new parameters. Only the needed columns are selected.
+SUBMISSION_SAMPLES_QUERY = (
+    select(Sample.sample_id, Sample.sample_name, Sample.ladder_id)
+    .where(Sample.submission_id == bindparam("submission_id"))
+    .order_by(Sample.sample_id)
+)
+LADDER_PIXELS_QUERY = (
+    select(LadderPixel.pixel_intensity, LadderPixel.base_pair_position)
+    .where(LadderPixel.ladder_id == bindparam("ladder_id"))
+    .order_by(LadderPixel.pixel_order)
+)
+# Streamed through a server-side cursor, a few lanes at a time
+SAMPLE_PIXEL_TRACES_QUERY = (
+    select(SamplePixelTrace.sample_id, SamplePixelTrace.pixel_intensity,
+           SamplePixelTrace.base_pair_position)
+    .where(SamplePixelTrace.sample_id.in_(bindparam("sample_ids", expanding=True)))
+    .execution_options(yield_per=16)
+)
+
+def fit_trace(values, length):
+    """
+    Cut or pad (with None) a pixel trace to the length of the ladder.
+    """
+    values = list(values or [])[:length]
+    return values + [None] * (length - len(values))
+
 def rebuild_electropherogram_and_bp_translation(submission_id, submission_folder):
     """
     Rebuild the signal table and bp_translation from DB and save as csv
@@ -772,7 +967,7 @@ def rebuild_electropherogram_and_bp_translation(submission_id, submission_folder
     try:
         with Session(engine) as session:
             # Get all samples for this submission in order
-            samples = session.query(Sample).filter(Sample.submission_id == submission_id).order_by(Sample.sample_id).all()
+            samples = session.execute(SUBMISSION_SAMPLES_QUERY, {"submission_id": submission_id}).all()
             if not samples:
                 logging.warning(f"No samples found for submission {submission_id}")
                 return None
@@ -780,30 +975,33 @@ def rebuild_electropherogram_and_bp_translation(submission_id, submission_folder
             sample_names = [s.sample_name for s in samples]
             # Get ladder_id from first sample (assume all samples in a submission use same ladder)
             ladder_id = samples[0].ladder_id
-            ladder_pixels = session.query(LadderPixel).filter(LadderPixel.ladder_id == ladder_id).order_by(LadderPixel.pixel_order).all()
+            ladder_pixels = session.execute(LADDER_PIXELS_QUERY, {"ladder_id": ladder_id}).all()
             ladder_values = [p.pixel_intensity for p in ladder_pixels]
             bp_positions = [p.base_pair_position for p in ladder_pixels]
             max_pixels = len(ladder_values)
-            # Fetch all sample pixels
-            pixels_query = session.query(SamplePixel).filter(SamplePixel.sample_id.in_(sample_ids)).order_by(SamplePixel.pixel_order).all()
+            # Stream the pixel traces, one row per sample: only the columns cut to the
+            # ladder length are kept, not all fetched rows
+            signal_columns = {}
+            bp_columns = {}
+            for trace in session.execute(SAMPLE_PIXEL_TRACES_QUERY, {"sample_ids": sample_ids}):
+                signal_columns[trace.sample_id] = fit_trace(trace.pixel_intensity, max_pixels)
+                bp_columns[trace.sample_id] = fit_trace(trace.base_pair_position, max_pixels)
+            missing_traces = [name for sample_id, name in zip(sample_ids, sample_names)
+                              if sample_id not in signal_columns]
+            if missing_traces:
+                # e.g. saved before sample_pixel_trace and not migrated (python -m database.migrate)
+                logging.warning("No pixels stored for samples %s of submission %s, their columns stay empty",
+                                missing_traces, submission_id)
             # Build electropherogram.csv (pixel intensities)
             df_signal = pd.DataFrame(index=range(max_pixels))
             df_signal['Ladder'] = ladder_values
             for i, sample_id in enumerate(sample_ids):
-                col_pixels = [None]*max_pixels
-                for p in pixels_query:
-                    if p.sample_id == sample_id and p.pixel_order < max_pixels:
-                        col_pixels[p.pixel_order] = p.pixel_intensity
-                df_signal[sample_names[i]] = col_pixels
+                df_signal[sample_names[i]] = signal_columns.get(sample_id) or fit_trace(None, max_pixels)
             # Build bp_translation.csv (base pair positions)
             df_bp = pd.DataFrame(index=range(max_pixels))
             df_bp['Ladder'] = bp_positions
             for i, sample_id in enumerate(sample_ids):
-                col_bp = [None]*max_pixels
-                for p in pixels_query:
-                    if p.sample_id == sample_id and p.pixel_order < max_pixels:
-                        col_bp[p.pixel_order] = p.base_pair_position
-                df_bp[sample_names[i]] = col_bp
+                df_bp[sample_names[i]] = bp_columns.get(sample_id) or fit_trace(None, max_pixels)
             # Save both files
             electro_path = os.path.join(submission_folder, "electropherogram.csv")
             df_signal.to_csv(electro_path, index=False)
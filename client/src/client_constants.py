@@ -61,9 +61,9 @@ MAX_CONT_LEN =  16 * 1000 * 1000 # Max. 16MB upload
 VM1_API_URL = os.getenv("VM1_API_URL")
 # Path to the certificate of vm1 in HTTPS requests.
 VM1_CERT_PATH = f"{DNAVI_ROOT}{os.getenv('VM1_CERT_FILE')}"
-# Files excluded from saving to vm1 file system
-EXCLUDED_FILES = [
+# Files excluded from saving to vm1 file system (set for O(1) lookups)
+EXCLUDED_FILES = {
     "electropherogram.csv",
     os.path.join("electropherogram", "signal_table.csv"),
     os.path.join("electropherogram", "qc", "bp_translation.csv")
-]
+}
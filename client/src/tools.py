@@ -7,17 +7,58 @@ Date: 2025-AUG-29 \n
 
 
 """
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import mmap
 import re
 import subprocess
 import shutil
 import os
+import zipfile
 import pandas as pd
 import sys
-from weasyprint import HTML
+import threading
+import time
 from jinja2 import Environment, FileSystemLoader
 import datetime
+import html
+import logging
 from .client_constants import ALLOWED_EXTENSIONS, DNAVI_EXE, EXCLUDED_FILES, SUCCESS_TOKEN
 
+logger = logging.getLogger(__name__)
+
+##############################################################################
+# !!! CRITICAL Set the python executable for DNAvi (it will not know other.)
+##############################################################################
+OUR_PYTHON = sys.executable
+DNAVI_ARGV_PREFIX = (OUR_PYTHON, DNAVI_EXE)
+# client/ folder, DNAvi logs are written relative to it
+MODULE_ROOT = os.path.dirname(os.path.abspath(__file__)).rsplit('src', 1)[0]
+# Normalised once so allowed_file is a single endswith call
+ALLOWED_SUFFIXES = tuple("." + e.lower().lstrip('.') for e in ALLOWED_EXTENSIONS)
+# Result file patterns, compiled once instead of per file in get_result_files
+PEAKS_RE = re.compile(r"peaks_[A-Za-z0-9_]+_sample\.svg$")
+OTHER_DIRS = ("plots", "qc", "stats")
+# Already compressed formats, stored as is in result archives
+STORED_SUFFIXES = (".png", ".jpg", ".jpeg", ".zip", ".gz")
+# File suffix for each archive format (shutil.make_archive names)
+ARCHIVE_SUFFIXES = {"zip": "zip", "tar": "tar", "gztar": "tar.gz",
+                    "bztar": "tar.bz2", "xztar": "tar.xz"}
+# Background archiving of result folders.
+# Threads are enough: zip runs as a subprocess and zlib releases the GIL.
+ARCHIVE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="archive")
+# Marker next to an archive that is still being built, checked by every worker
+PENDING_SUFFIX = ".pending"
+# Seconds after which a marker is taken as left over from a crashed worker
+ARCHIVE_STALE_AFTER = 15 * 60
+# Event loop shared by all DNAvi runs, started on first use (see dnavi_loop)
+DNAVI_LOOP = None
+DNAVI_LOOP_LOCK = threading.Lock()
+# Lines of DNAvi output kept for the error log
+DNAVI_LOG_TAIL = 200
+
 
 def df2html(df, meta_df):
     """
@@ -31,7 +72,7 @@ def df2html(df, meta_df):
     """
     section_dict = df.to_dict()
     retrieve_status = section_dict['retrieve_from']
-    columns_avail = meta_df.columns.tolist()
+    columns_avail = set(meta_df.columns)
     item2string = section_dict["Item"]
     disclaimer_dict = section_dict['disclaimer']
     disclaimer = "/"
@@ -52,7 +93,7 @@ def df2html(df, meta_df):
 
         # Or get the data from other columns
         if retrieve_from != "FALSE":
-            collect_from = [col for col in retrieve_status[item].split(",")
+            collect_from = [col for col in retrieve_from.split(",")
                             if col in columns_avail]
             item_df = meta_df[collect_from]
 
@@ -66,10 +107,17 @@ def df2html(df, meta_df):
         # Add Item ID & Patient ID & move to front
         #item_df[f"Item {item}"] = ""
 
-        # Add a header and (if applicable) a disclaimer
-        header_df = pd.DataFrame(columns=[f"Item {item}", item_string])
+        # Add a header and (if applicable) a disclaimer. Built as a plain
+        # string, same markup as DataFrame.to_html but without a DataFrame.
+        disclaimer_row = ""
         if disclaimer_present != "FALSE":
-            header_df.loc[len(header_df)] =  ["!", f"Disclaimer: {disclaimer}"]
+            disclaimer_row = (f'<tr><td>!</td>'
+                              f'<td>{html.escape(f"Disclaimer: {disclaimer}")}</td></tr>')
+        header_html = (f'<table border="1" class="dataframe table table-bordered">'
+                       f'<thead><tr style="text-align: right;">'
+                       f'<th>{html.escape(f"Item {item}")}</th>'
+                       f'<th>{html.escape(str(item_string))}</th></tr></thead>'
+                       f'<tbody>{disclaimer_row}</tbody></table>')
         item_df["Patient ID"] = item_df.index
         item_df.reset_index(drop=True, inplace=True)
         starting_cols = ["Patient ID"]
@@ -77,7 +125,7 @@ def df2html(df, meta_df):
         item_df = item_df[col_order]
 
         # Append to the html-converted dataframe to the collection
-        dfs_to_pass.append([header_df.to_html(classes='table table-bordered', index=False,),
+        dfs_to_pass.append([header_html,
                             item_df.to_html(classes='table table-bordered', index=False,)])
 
     # Return the dataframe collection
@@ -115,7 +163,7 @@ def file2pdf(file_dir, title="DNAvi Liquid Biopsy Report",
     ##############################################################################
     dfs_final = []
     for section in df["category"].unique():
-        print(f"----- SECTION {section}")
+        logger.debug("----- SECTION %s", section)
         section_df = df[df["category"] == section]
         # Convert to a pretty html output:
         dfs_to_pass = df2html(section_df, meta_df)
@@ -140,120 +188,427 @@ def file2pdf(file_dir, title="DNAvi Liquid Biopsy Report",
     # Render our file and create the PDF using our css style file
     html_out = template.render(template_vars)
 
+    # Imported here: weasyprint loads the pango system libraries, which only the
+    # PDF report needs (archiving and result listing work without them)
+    from weasyprint import HTML
     HTML(string=html_out).write_pdf(out_pdf, stylesheets=[style_dir])
-    print(f"--- Saved pdf report to: {out_pdf}")
+    logger.debug("--- Saved pdf report to: %s", out_pdf)
     # END OF PDF REPORT FUNCTION
 
+@lru_cache(maxsize=1024)
 def allowed_file(filename):
     """
     Function to check if a file is allowed
     :param filename: str
     :return: str
     """
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(ALLOWED_SUFFIXES)
 
 
-def run_cmd(cmd):
+def dnavi_argv(in_vars):
+    """
+    Build the DNAvi command line from user inputs
+    :param in_vars: list of tuples (arg:val)
+    :return: list, argv for DNAvi
     """
-    Submit a command to shell and W A I T
+    # Arguments are passed as a list, so user values are never parsed by a shell
+    argv = list(DNAVI_ARGV_PREFIX)
+    argv.extend(flag for argument, variable in in_vars
+                for flag in (f"-{argument}", str(variable)))
+    logger.debug("%s", argv)
+    return argv
+    # END OF FUNCTION
 
-    :param cmd: Command to be executed
-    :return: subprocess is opened
 
+def check_dnavi_output(outpt, log_dir="/log/dnavi.log", success=None):
     """
-    p = subprocess.Popen(cmd,
-                         stdout=subprocess.PIPE,
-                         shell=True)
-    (output, err) = p.communicate()
-    output = output.decode("utf-8")
-    if "error" in output:
-        print("Written error: " + output)
+    Require the SUCCESS_TOKEN (a string) in DNAvi's output to not throw the error.
+    :param outpt: str, DNAvi stdout (or its last lines)
+    :param log_dir: str (where to write log info to)
+    :param success: bool, token already seen while streaming (None = search outpt)
+    :return: tuple ("", error message or None)
+    """
+    if success is None:
+        success = SUCCESS_TOKEN in outpt
+    if not success:
+        error = outpt
+        # Save error to log file
+        with open(f"{MODULE_ROOT}{log_dir}", "w") as text_file:
+            text_file.write(error)
+        text_file.close()
+        error_msg = f"--- Error occured: {outpt}, also see {log_dir}."
+        return "", error_msg
+
+    else:
+        return "", None # set error to None
+    # END OF FUNCTION
 
-    p_status = p.wait()  # Critical
 
-    return output, err
+async def stream_cmd_async(argv, token, tail_lines=DNAVI_LOG_TAIL):
+    """
+    Run a command and read its stdout line by line instead of buffering
+    all of it. Only the last tail_lines lines are kept (for the error log).
+
+    :param argv: list, program and its arguments
+    :param token: str, marker to look for in the output
+    :param tail_lines: int, number of trailing stdout lines to keep
+    :return: tuple (token seen, last stdout lines, decoded stderr)
+    """
+    p = await asyncio.create_subprocess_exec(*argv,
+                                             stdout=asyncio.subprocess.PIPE,
+                                             stderr=asyncio.subprocess.PIPE,
+                                             limit=2 ** 20)
+    # Drain stderr concurrently so a full pipe cannot stall the child
+    err_task = asyncio.ensure_future(p.stderr.read())
+    tail = deque(maxlen=tail_lines)
+    seen = False
+    completed = False
+    try:
+        async for line in p.stdout:
+            line = line.decode("utf-8", errors="replace")
+            logger.debug("%s", line.rstrip("\n"))
+            if not seen and token in line:
+                seen = True
+            tail.append(line)
+        err = (await err_task).decode("utf-8", errors="replace")
+        completed = True
+    finally:
+        # On errors while reading (e.g. a line longer than limit) the child
+        # is still running: kill it, then reap it and the stderr reader
+        if not completed:
+            if p.returncode is None:
+                try:
+                    p.kill()
+                except ProcessLookupError:
+                    pass
+            err_task.cancel()
+            try:
+                await err_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        await p.wait()
+    if err:
+        logger.warning("%s", err)
+    return seen, "".join(tail), err
     # END OF FUNCTION
 
+
+async def input2dnavi_async(in_vars, log_dir="/log/dnavi.log"):
+    """
+    Async version of input2dnavi, DNAvi runs of several requests
+    then share one event loop instead of one waiting thread each.
+    :param in_vars: list of tuples (arg:val)
+    :param log_dir: str (where to write log info to)
+    :return: tuple ("", error message or None)
+    """
+    seen, outpt, err = await stream_cmd_async(dnavi_argv(in_vars), SUCCESS_TOKEN)
+    return check_dnavi_output(outpt, log_dir, success=seen)
+    # END OF FUNCTION
+
+
+def dnavi_loop():
+    """
+    Shared event loop (running in a daemon thread) for DNAvi subprocesses
+    :return: asyncio event loop
+    """
+    global DNAVI_LOOP
+    with DNAVI_LOOP_LOCK:
+        if DNAVI_LOOP is None:
+            DNAVI_LOOP = asyncio.new_event_loop()
+            threading.Thread(target=DNAVI_LOOP.run_forever, name="dnavi-loop",
+                             daemon=True).start()
+    return DNAVI_LOOP
+    # END OF FUNCTION
+
+
 def input2dnavi(in_vars, log_dir="/log/dnavi.log"):
     """
     Function to transform user inputs into command-line usable arguments
-    for DNAvi
+    for DNAvi and run it. Sync wrapper around input2dnavi_async for the
+    Flask routes.
     in_vars: list of tuples (arg:val)
     :param in_dict: list of tuples (arg:val)
     :param log_dir: str (where to write log info to)
     :return:submit cmd
     """
+    future = asyncio.run_coroutine_threadsafe(input2dnavi_async(in_vars, log_dir),
+                                              dnavi_loop())
+    return future.result()
+    # END OF FUNCTION
 
 
-    ##############################################################################
-    # !!! CRITICAL Set the python executable for DNAvi (it will not know other.)
-    ##############################################################################
-    OUR_PYTHON=sys.executable
-    cmd = f"{OUR_PYTHON} {DNAVI_EXE}"
+def zip_native(archive_path, root_dir, compresslevel=1):
+    """
+    Zip the content of root_dir with the system zip binary, which is
+    considerably faster than Python's zipfile for larger result folders.
 
-    for argument, variable in in_vars:
-        print(argument, variable)
-        cmd += f" -{argument} {variable}"
-    print(cmd)
-    ##############################################################################
-    # Actually run DNAvi
-    ##############################################################################
-    outpt, err = run_cmd(cmd)
-    print(outpt)
+    :param archive_path: str, path of the archive to create
+    :param root_dir: str, folder whose content is archived
+    :param compresslevel: int, deflate level (0 = no compression, 1-9)
+    :return: bool, True if the archive was written
+    """
+    zip_exe = shutil.which("zip")
+    if zip_exe is None:
+        return False
+    archive_path = os.path.abspath(archive_path)
+    # zip would otherwise update an existing archive in place
+    if os.path.exists(archive_path):
+        os.remove(archive_path)
+    try:
+        # -n: store already compressed files instead of deflating them again
+        # (suffix match is case sensitive, so pass both cases)
+        stored = ":".join(STORED_SUFFIXES + tuple(e.upper() for e in STORED_SUFFIXES))
+        subprocess.run([zip_exe, "-q", "-D", f"-{compresslevel}",
+                        "-n", stored, "-r", archive_path, "."],
+                       cwd=root_dir, check=True, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning("Native zip failed, falling back to zipfile: %s", e)
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+        return False
+    return True
+    # END OF FUNCTION
 
-    ##############################################################################
-    # Require the SUCCESS_TOKEN (a string) to not throw the error.
-    ##############################################################################
-    if SUCCESS_TOKEN not in outpt:
-        error = outpt
-        # Save error to log file
-        abs_dirname = os.path.dirname(os.path.abspath(__file__))
-        with open(f"{abs_dirname.rsplit('src', 1)[0]}{log_dir}", "w") as text_file:
-            text_file.write(error)
-        text_file.close()
-        error_msg = f"--- Error occured: {outpt}, also see {log_dir}."
-        return "", error_msg
 
-    elif SUCCESS_TOKEN in outpt:
-        return "", None # set error to None
+def make_zip_archive(base_name, root_dir, compresslevel=1):
+    """
+    Zip the content of root_dir into base_name.zip (replaces shutil.make_archive).
+    The system zip binary is used when available (see zip_native).
+    Otherwise each file is memory-mapped and handed to zipfile as one buffer, which is
+    used for both the CRC and the compressed write instead of being copied
+    chunk by chunk into Python bytes objects.
+    DNAvi results are mostly images and small tables, so deflate level 1 is
+    used by default; level 0 stores the files uncompressed. Files that are
+    compressed already (STORED_SUFFIXES) are always stored.
+
+    :param base_name: str, path of the archive without the .zip extension
+    :param root_dir: str, folder whose content is archived
+    :param compresslevel: int, deflate level (0 = no compression, 1-9)
+    :return: str, path of the created archive
+    """
+    archive_path = f"{base_name}.zip"
+    if zip_native(archive_path, root_dir, compresslevel):
+        return archive_path
+    compression = zipfile.ZIP_STORED if compresslevel == 0 else zipfile.ZIP_DEFLATED
+    level = None if compresslevel == 0 else compresslevel
+    with zipfile.ZipFile(archive_path, "w", compression=compression,
+                         compresslevel=level) as zf:
+        for dirpath, _, filenames in os.walk(root_dir):
+            for name in filenames:
+                full_path = os.path.join(dirpath, name)
+                zinfo = zipfile.ZipInfo.from_file(full_path,
+                                                  os.path.relpath(full_path, root_dir))
+                # Already compressed files are only stored
+                if name.lower().endswith(STORED_SUFFIXES):
+                    entry_type, entry_level = zipfile.ZIP_STORED, None
+                else:
+                    entry_type, entry_level = compression, level
+                with open(full_path, "rb") as src:
+                    # Empty files cannot be mapped
+                    if zinfo.file_size == 0:
+                        zf.writestr(zinfo, b"", compress_type=entry_type,
+                                    compresslevel=entry_level)
+                        continue
+                    with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        zf.writestr(zinfo, mapped, compress_type=entry_type,
+                                    compresslevel=entry_level)
+    return archive_path
+    # END OF FUNCTION
+
+
+def move_path(src, dst):
+    """
+    Move src to dst with a single rename, falling back to shutil.move
+    (copy + delete) when dst is on another filesystem or already exists.
+
+    :param src: str
+    :param dst: str, full target path (not the parent folder)
+    :return: str, dst
+    """
+    try:
+        os.rename(src, dst)
+    except OSError:
+        shutil.move(src, dst)
+    return dst
+    # END OF FUNCTION
+
+
+def claim_archive(archive_path):
+    """
+    Mark archive_path as being built. The marker is the file
+    archive_path + PENDING_SUFFIX, created with O_EXCL, so it is seen by every
+    worker process and only one caller can hold it. A marker older than
+    ARCHIVE_STALE_AFTER (left by a crashed worker) is replaced.
+
+    :param archive_path: str, final path of the archive in the download folder
+    :return: bool, False if another job is already building the archive
+    """
+    marker = archive_path + PENDING_SUFFIX
+    for _ in range(2):
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            if archive_pending(archive_path):
+                return False
+            release_archive(archive_path)
+    return False
+    # END OF FUNCTION
+
+
+def release_archive(archive_path):
+    """
+    Remove the pending marker of archive_path (see claim_archive).
+
+    :param archive_path: str, final path of the archive in the download folder
+    """
+    try:
+        os.remove(archive_path + PENDING_SUFFIX)
+    except FileNotFoundError:
+        pass
+    # END OF FUNCTION
+
+
+def archive_pending(archive_path):
+    """
+    :param archive_path: str, final path of the archive in the download folder
+    :return: bool, True while a job in any worker process is building the archive
+    """
+    try:
+        age = time.time() - os.path.getmtime(archive_path + PENDING_SUFFIX)
+    except FileNotFoundError:
+        return False
+    return age < ARCHIVE_STALE_AFTER
+    # END OF FUNCTION
+
+
+def gztar_native(base_name, root_dir, compresslevel=1):
+    """
+    Create base_name.tar.gz by piping tar into pigz, which compresses on
+    all cores (Python's gzip module uses one).
+
+    :param base_name: str, path of the archive without extension
+    :param root_dir: str, folder whose content is archived
+    :param compresslevel: int, gzip level (1-9)
+    :return: str, path of the archive or None if pigz/tar are missing or failed
+    """
+    tar_exe, pigz_exe = shutil.which("tar"), shutil.which("pigz")
+    if tar_exe is None or pigz_exe is None:
+        return None
+    archive_path = f"{base_name}.tar.gz"
+    try:
+        with open(archive_path, "wb") as out:
+            tar_p = subprocess.Popen([tar_exe, "-cf", "-", "-C", root_dir, "."],
+                                     stdout=subprocess.PIPE)
+            gz_p = subprocess.Popen([pigz_exe, f"-{compresslevel}"],
+                                    stdin=tar_p.stdout, stdout=out)
+            # Only pigz reads the pipe now, so tar gets SIGPIPE if pigz dies
+            tar_p.stdout.close()
+            gz_status, tar_status = gz_p.wait(), tar_p.wait()
+    except OSError as e:
+        gz_status, tar_status = None, e
+    if gz_status != 0 or tar_status != 0:
+        logger.warning("Native tar/pigz failed, falling back to shutil: %s %s",
+                       tar_status, gz_status)
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+        return None
+    return archive_path
+    # END OF FUNCTION
+
+
+def build_archive(zip_path, root_dir, arx="zip"):
+    """
+    Archive a result folder. Runs on ARCHIVE_POOL so the request
+    thread does not wait for it.
+    The archive is written under a temporary name in the same folder and
+    renamed into place when complete, so no worker ever serves a partly
+    written archive.
+
+    :param zip_path: str, path of the archive without extension
+    :param root_dir: str, folder whose content is archived
+    :param arx: str, archive format
+    :return: str, path of the archive
+    """
+    suffix = ARCHIVE_SUFFIXES.get(arx, arx)
+    final_path = f"{zip_path}.{suffix}"
+    tmp_base = f"{zip_path}.partial-{os.getpid()}-{threading.get_ident()}"
+    tmp_path = f"{tmp_base}.{suffix}"
+    try:
+        archive_path = None
+        if arx == "zip":
+            archive_path = make_zip_archive(tmp_base, root_dir)
+        elif arx == "gztar":
+            archive_path = gztar_native(tmp_base, root_dir)
+        if archive_path is None:
+            archive_path = shutil.make_archive(tmp_base, arx, root_dir)
+        os.replace(archive_path, final_path)
+    except BaseException:
+        # The writer may have failed half way, before the rename
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    logger.debug("Archive ready: %s", final_path)
+    return final_path
     # END OF FUNCTION
 
 
 def move_dnavi_files(request_id="", error=None, upload_folder="", download_folder="",
                      arx="zip"):
     """
-    Function to move dnavi files
+    Function to move dnavi files.
+    The result folder is moved right away so the results page can be
+    rendered, the archive for download is built in the background
+    (see archive_pending).
     :param error: str
     :param upload_folder: str
     :param download_folder: str
     :return:
     """
-    current_folder_loc = f"{upload_folder}{request_id}"
-
     output_id = request_id
     interm_destination = f"{upload_folder}{output_id}"
     final_destination = f"{download_folder}{output_id}"
-    print(interm_destination)
-    print(current_folder_loc)
-    print(final_destination)
-
-    print("Compressing to: ", f"{interm_destination}.{arx}")
-    zip_path = f"{interm_destination}_compressed"
-    shutil.make_archive(zip_path, arx, current_folder_loc)
-
-    if os.path.isfile(f"{zip_path}.{arx}"):
-        shutil.move(f"{interm_destination}", final_destination + "/")
-        shutil.move(f"{zip_path}.{arx}", download_folder + "/")
-        print("Success, moving now from: ", interm_destination)
-        print("Success, moving now to: ", final_destination)
-        # Delete the parent folder of interm_destination only if it is empty
-        # because if parallel submissions happen per user, need to wait and
-        # not delete the uploads file until all finished
-        parent_folder = os.path.dirname(interm_destination)
-        if os.path.isdir(parent_folder) and not os.listdir(parent_folder):
-            shutil.rmtree(parent_folder)
-            print(f"Deleted {parent_folder} folder from uploads")
+    logger.debug("%s", interm_destination)
+    logger.debug("%s", final_destination)
+
+    if not os.path.isdir(interm_destination):
+        return output_id
+
+    # The archive is written straight into the download folder
+    zip_path = f"{final_destination}_compressed"
+    archive_path = f"{zip_path}.{ARCHIVE_SUFFIXES.get(arx, arx)}"
+    # Claimed before the folder shows up in the download folder, so no other
+    # worker starts a rebuild of it in the meantime
+    if not claim_archive(archive_path):
+        logger.warning("Archive already being built: %s", archive_path)
+        archive_path = None
+
+    move_path(interm_destination, final_destination)
+    logger.debug("Success, moving now from: %s", interm_destination)
+    logger.debug("Success, moving now to: %s", final_destination)
+    # Delete the parent folder of interm_destination only if it is empty
+    # because if parallel submissions happen per user, need to wait and
+    # not delete the uploads file until all finished
+    parent_folder = os.path.dirname(interm_destination)
+    if os.path.isdir(parent_folder) and not os.listdir(parent_folder):
+        shutil.rmtree(parent_folder)
+        logger.debug("Deleted %s folder from uploads", parent_folder)
+
+    if archive_path is None:
+        return output_id
+
+    def _archive():
+        try:
+            return build_archive(zip_path, final_destination, arx)
+        except Exception as e:
+            logger.error("Archiving failed: %s", e)
+            raise
+        finally:
+            release_archive(archive_path)
+
+    logger.debug("Compressing to: %s", archive_path)
+    ARCHIVE_POOL.submit(_archive)
 
     return output_id
     # END OF FUNCTION
@@ -268,7 +623,7 @@ def get_result_files(folder, prefix=''):
       - pdf_files: PDF files (DNAviReport.pdf)
 
     :param folder: str, base folder to search
-    :param prefix: str, relative prefix (used internally for recursion)
+    :param prefix: str, relative prefix prepended to the returned paths
     :return: tuple of lists: (statistics_files, peaks_files, other_files, pdf_files)
     """
     statistics_files = []
@@ -277,49 +632,50 @@ def get_result_files(folder, prefix=''):
     pdf_files = []
     html_files = []
 
-    for f in os.listdir(folder):
-        full_path = os.path.join(folder, f)
-        relative_path = os.path.join(prefix, f) if prefix else f
-
-        if os.path.isdir(full_path):
-            # Recursively extend lists
-            stats, peaks, other, pdfs, htmls = get_result_files(full_path, relative_path)
-            statistics_files.extend(stats)
-            peaks_files.extend(peaks)
-            other_files.extend(other)
-            pdf_files.extend(pdfs)
-            html_files.extend(htmls)
-        else:
-            fname = f.lower()
-            rel_lower = relative_path.lower()
-            # CSV statistics files 
-            if fname.endswith(".csv") and "statistics" in fname:
-                try:
-                    df = pd.read_csv(full_path)
-                    # Show all rows if it's a basic_statistics file
-                    if("basic_statistics" in fname):
-                        preview = df.to_dict(orient='records')
-                    # Show only first 5 rows otherwise
-                    else:
-                        preview = df.head(5).to_dict(orient='records')
-                except Exception:
-                    preview = []
-                statistics_files.append({'name': relative_path,
-                                         'preview': preview,
-                                         'columns': list(df.columns) if preview else []})
-            # Peaks PNG
-            elif re.match(r"peaks_[A-Za-z0-9_]+_sample\.svg$", fname):
-                peaks_files.append(relative_path)
-            # Other PNGs in plots/qc/stats
-            elif fname.endswith(".svg") and any(folder_name in rel_lower
-                                                for folder_name in ["plots", "qc", "stats"]):
-                other_files.append(relative_path)
-            # PDF files
-            elif os.path.basename(f).lower() == "dnavireport.pdf":
-                pdf_files.append(relative_path)
-            # HTML files
-            elif fname.endswith(".html"):
-                html_files.append(relative_path)
+    # Explicit stack instead of recursion: no frame per directory and no
+    # recursion limit on deep result trees
+    stack = [(folder, prefix)]
+    while stack:
+        folder, prefix = stack.pop()
+        # scandir caches the entry type, so no extra stat call per file
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                relative_path = os.path.join(prefix, entry.name) if prefix else entry.name
+
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, relative_path))
+                    continue
+
+                fname = entry.name.lower()
+                rel_lower = relative_path.lower()
+                # CSV statistics files
+                if fname.endswith(".csv") and "statistics" in fname:
+                    try:
+                        df = pd.read_csv(entry.path)
+                        # Show all rows if it's a basic_statistics file
+                        if("basic_statistics" in fname):
+                            preview = df.to_dict(orient='records')
+                        # Show only first 5 rows otherwise
+                        else:
+                            preview = df.head(5).to_dict(orient='records')
+                    except Exception:
+                        preview = []
+                    statistics_files.append({'name': relative_path,
+                                             'preview': preview,
+                                             'columns': list(df.columns) if preview else []})
+                # Peaks PNG
+                elif PEAKS_RE.match(fname):
+                    peaks_files.append(relative_path)
+                # Other PNGs in plots/qc/stats
+                elif fname.endswith(".svg") and any(folder_name in rel_lower
+                                                    for folder_name in OTHER_DIRS):
+                    other_files.append(relative_path)
+                # PDF files
+                elif fname == "dnavireport.pdf":
+                    pdf_files.append(relative_path)
+                # HTML files
+                elif fname.endswith(".html"):
+                    html_files.append(relative_path)
 
     return statistics_files, peaks_files, other_files, pdf_files, html_files
     # END OF FUNCTION
@@ -336,15 +692,14 @@ def get_all_files_except_saved_in_db(folder, prefix=''):
     :return: list of FULL PATHS of files found in folder and subfolders
     """
     collected_files = []
-    for f in os.listdir(folder):
-        full_path = os.path.join(folder, f)
-        relative_path = os.path.join(prefix, f) if prefix else f
-        if os.path.isdir(full_path):
-            # Gather files inside subfolders
-            collected_files.extend(get_all_files_except_saved_in_db(full_path, relative_path))
-        else:
+    # scandir reuses the directory entry type, saving one stat call per file
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            relative_path = os.path.join(prefix, entry.name) if prefix else entry.name
+            if entry.is_dir():
+                # Gather files inside subfolders
+                collected_files.extend(get_all_files_except_saved_in_db(entry.path, relative_path))
             # Skip files already saved in db
-            if relative_path in EXCLUDED_FILES:
-                continue
-            collected_files.append(relative_path)
+            elif relative_path not in EXCLUDED_FILES:
+                collected_files.append(relative_path)
     return collected_files
\ No newline at end of file
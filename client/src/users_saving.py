@@ -1,38 +1,71 @@
 from uuid import uuid4
 
-from flask import session
+from flask import g, session
 from flask_login import current_user
-from werkzeug.security import generate_password_hash
+
+from sqlalchemy.dialects.postgresql import insert
 
 from database.config import SessionLocal
-from database.schema.user_details import UserDetails
+from database.schema.user_details import PASSWORD_HASHER, UserDetails
 
 def get_username():
     """
     Returns the current user's username if logged in,
     if the user is not logged in, generates a unique guest ID the first time 
-    and stores it in the session, so subsequent requests from same session use the same guest ID
+    and stores it in the session, so subsequent requests from same session use the same guest ID.
+    The result is cached in flask.g, so the user is only resolved once per request.
     
     """
+    username = g.get('_username')
+    if username is not None:
+        return username
     if current_user.is_authenticated:
-        return current_user.id
-    if 'guest_id' not in session:
-        session['guest_id'] = f"guest_{uuid4().hex[:8]}"
-    return session['guest_id']
+        username = current_user.id
+    else:
+        username = session.get('guest_id')
+        if username is None:
+            username = f"guest_{uuid4().hex[:8]}"
+            session['guest_id'] = username
+    g._username = username
+    return username
 
 
 def save_user(username: str, password: str):
     """
     Save a new user to the database.
-    Password is hashed before saving.
+    Password is hashed (argon2, see UserDetails.set_password) before saving.
     """
     db = SessionLocal()
     try:
-        user = UserDetails(username=username, password_hash=generate_password_hash(password))
+        user = UserDetails(username=username)
+        user.set_password(password)
         db.add(user)
         db.commit()
     except Exception as e:
-        session.rollback()
+        db.rollback()
         raise e
     finally:
         db.close()
+
+
+def save_users_bulk(users):
+    """
+    Save many users in one INSERT statement (one round trip).
+    Usernames that already exist are skipped.
+    :param users: iterable of (username, password) tuples
+    :return: int, number of users inserted
+    """
+    rows = [{"username": username, "password_hash": PASSWORD_HASHER.hash(password)}
+            for username, password in users]
+    if not rows:
+        return 0
+    with SessionLocal() as db:
+        try:
+            result = db.execute(insert(UserDetails)
+                                .values(rows)
+                                .on_conflict_do_nothing(index_elements=["username"]))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+    return result.rowcount
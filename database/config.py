@@ -21,10 +21,21 @@ DATABASE_URL = (
 
 # The engine handles database communication and connection details.
 # engine uses the database driver under the hood to connect to the database.
+# executemany_mode: batch executemany() calls that cannot use multi-row VALUES
+# query_cache_size: compiled SQL statements kept per engine (default 500), sized
+# for the statements of all tables so that repeated queries are not recompiled
+# pool_use_lifo: reuse the most recently returned connection, whose server side
+# plan and catalog caches are warm, instead of rotating through the whole pool
 engine = create_engine(DATABASE_URL,
+                       pool_size=25,
+                       max_overflow=25,
                        pool_pre_ping=True,
-                       pool_recycle=300,
-                       pool_timeout=30)
+                       pool_recycle=1800,
+                       pool_timeout=30,
+                       pool_use_lifo=True,
+                       executemany_mode="values_plus_batch",
+                       query_cache_size=1200)
 # Session handles work with python objects and when/how to send those changes to the database.
 # Keeps track of all the ORM objects
-SessionLocal = sessionmaker(bind=engine)
+# expire_on_commit=False: loaded attributes stay readable after commit without a re-SELECT
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
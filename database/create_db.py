@@ -2,9 +2,12 @@
 One time script to create the database tables.
 """
 # Run script using: python -m database.create_db
-from sqlalchemy.dialects.postgresql import insert
+# Once the tables exist, only (re)seed them with: python -m database.create_db --seed-only
+import argparse
+
 from database.config import SessionLocal, engine
 from database.schema.base import Base
+from database.seed import seed_default_values
 # Pylint should not report about unused imports here as they are necessary for table
 # creation in SQLAlchemy syntax.
 # pylint: disable=unused-import
@@ -18,113 +21,37 @@ from database.schema import (
     ladder_peak,
     ladder_pixel,
     ontology_term,
-    sample_pixel,
+    sample_pixel_trace,
     sample,
     subject,
     submission
     )
-# Create all tables
-Base.metadata.create_all(engine)
 
-###############################################################################
-#                    INSERT DEFAULT METADATA                                  #
-###############################################################################
-def seed_default_values():
+
+def main(seed_only: bool = False):
     """
-    This method initializes the database with default values including, onotology term and gel devices.
+    Create all tables and insert the default metadata
+    (ontology terms and gel devices, see database/seed.py).
+    With seed_only the table creation is skipped: create_all checks every
+    table against the catalog on each run, which is not needed after the
+    first setup.
     """
-    ontology_term_rows = [
-        {
-            "term_label": "male",
-            "term_id": "PATO:0000384",
-            "ontology_description": "A biological sex quality inhering in an individual or a population whose sex organs contain only male gametes."
-        },
-        {
-            "term_label": "female",
-            "term_id": "PATO:0000383",
-            "ontology_description": "A biological sex quality inhering in an individual or a population that only produces gametes that can be fertilised by male gametes."
-        },
-        {
-            "term_label": "hermaphrodite",
-            "term_id": "PATO:0001340",
-            "ontology_description": "An organism having both male and female sexual characteristics and organs."
-        },
-        {
-            "term_label": "pseudohermaphrodite",
-            "term_id": "PATO:0001827",
-            "ontology_description": "Having internal reproductive organs of one sex and external sexual characteristics of the other sex."
-        },
-        {
-            "term_label": "unknown",
-            "term_id": "NCIT:C17998",
-            "ontology_description": "The biological sex is unknown, not assessed or not available."
-        }
-    ]
-    
-    sex_info_rows = [
-        {"biological_sex": "male", "biological_sex_term_id": "PATO:0000384"},
-        {"biological_sex": "female", "biological_sex_term_id": "PATO:0000383"},
-        {"biological_sex": "hermaphrodite", "biological_sex_term_id": "PATO:0001340"},
-        {"biological_sex": "pseudohermaphrodite", "biological_sex_term_id": "PATO:0001827"},
-        {"biological_sex": "unknown", "biological_sex_term_id": "NCIT:C17998"},
-    ]
-    
-    gel_electrophoresis_devices_rows = [
-        {
-            "device_name": "2100 Bioanalyzer Instrument, Agilent"
-        },
-        {
-            "device_name": "4150 TapeStation System, Agilent"
-        },
-        {
-            "device_name": "4200 TapeStation System, Agilent"
-        },
-        {
-            "device_name": "5200 Fragment Analyzer System, Agilent"
-        },
-        {
-            "device_name": "5300 Fragment Analyzer System, Agilent"
-        },
-        {
-            "device_name": "5400 Fragment Analyzer System, Agilent"
-        },
-        {
-            "device_name": "Qsep 1 Bio-Fragment Analyzer, Nippon"
-        },
-        {
-            "device_name": "Qsep 100 Bio-Fragment Analyzer, Nippon"
-        },
-        {
-            "device_name": "Qsep 400 Bio-Fragment Analyzer, Nippon"
-        }
-    ]
-
-    with SessionLocal() as session:
-        # Seed sex in ontology terms table
-        for row in ontology_term_rows:
-            stmt = (
-                insert(ontology_term.OntologyTerm)
-                .values(**row)
-                .on_conflict_do_nothing(index_elements=["term_id"])
-            )
-            session.execute(stmt)
-        # Seed sex in sex info table
-        for row in sex_info_rows:
-            stmt = (
-                insert(biological_sex_info.BiologicalSexInfo)
-                .values(**row)
-                .on_conflict_do_nothing(index_elements=["biological_sex"])
-            )
-            session.execute(stmt)
-        # Seed devices
-        for row in gel_electrophoresis_devices_rows:
-            stmt = (
-                insert(gel_electrophoresis_devices.GelElectrophoresisDevice)
-                .values(**row)
-                .on_conflict_do_nothing(index_elements=["device_name"])
-            )
-            session.execute(stmt)
+    if not seed_only:
+        # Create all tables
+        Base.metadata.create_all(engine)
+    ###########################################################################
+    #                    INSERT DEFAULT METADATA                              #
+    ###########################################################################
+    # Write-only session: nothing is read back after the commit,
+    # so skip expiring/refreshing objects and the autoflush checks
+    with SessionLocal(expire_on_commit=False, autoflush=False) as session:
+        seed_default_values(session)
         session.commit()
+    print("Database setup completed successfully!")
+
 
-seed_default_values()
-print("Database setup completed successfully!")
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the DNAvi database tables and seed them.")
+    parser.add_argument("--seed-only", action="store_true",
+                        help="only insert the default metadata, the tables already exist")
+    main(seed_only=parser.parse_args().seed_only)
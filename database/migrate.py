@@ -0,0 +1,211 @@
+"""
+Upgrade an existing database to the current schema.
+create_all only creates missing tables, it never changes existing ones. Each step below
+changes one part of the schema in place, in its own transaction, and is skipped when the
+database already has that change (new databases have all of them).
+"""
+# Run script using: python -m database.migrate
+# Run it on existing databases before python -m database.create_db
+from sqlalchemy import inspect, text
+
+from database.config import engine
+from database.schema.sample_pixel_trace import SamplePixelTrace
+
+
+def column_info(conn, table, column):
+    """
+    Return the information_schema.columns row of table.column, None if it does not exist.
+    """
+    return conn.execute(
+        text("SELECT data_type, udt_name, collation_name FROM information_schema.columns "
+             "WHERE table_schema = current_schema() AND table_name = :table "
+             "AND column_name = :column"),
+        {"table": table, "column": column}
+    ).mappings().first()
+
+
+# biological_sex_info is keyed by its ontology term id, subject references that
+# term id instead of the biological_sex_enum value
+BIOLOGICAL_SEX_TERM_ID_SQL = (
+    "ALTER TABLE subject ADD COLUMN biological_sex_term_id VARCHAR(50)",
+    "UPDATE subject SET biological_sex_term_id = b.biological_sex_term_id "
+    "FROM biological_sex_info b WHERE b.biological_sex = subject.biological_sex",
+    # Drops the old foreign key and index of the column as well
+    "ALTER TABLE subject DROP COLUMN biological_sex",
+    "ALTER TABLE biological_sex_info DROP COLUMN biological_sex",
+    "DROP INDEX IF EXISTS ix_biological_sex_info_biological_sex_term_id",
+    "ALTER TABLE biological_sex_info ADD PRIMARY KEY (biological_sex_term_id)",
+    "ALTER TABLE subject ADD CONSTRAINT subject_biological_sex_term_id_fkey "
+    "FOREIGN KEY (biological_sex_term_id) "
+    "REFERENCES biological_sex_info (biological_sex_term_id) ON DELETE CASCADE",
+    "CREATE INDEX ix_subject_biological_sex_term_id ON subject (biological_sex_term_id)",
+    "DROP TYPE IF EXISTS biological_sex_enum",
+)
+
+
+def migrate_biological_sex_term_id(conn):
+    """
+    Key biological_sex_info by biological_sex_term_id and replace subject.biological_sex
+    by subject.biological_sex_term_id.
+    """
+    if column_info(conn, "biological_sex_info", "biological_sex") is None:
+        return False
+    for statement in BIOLOGICAL_SEX_TERM_ID_SQL:
+        conn.execute(text(statement))
+    return True
+
+
+# The sample age is kept in whole months (SMALLINT) instead of years (Float). Ages that
+# do not fit the column are stored as NULL, as save_samples does with new ones
+SAMPLE_AGE_MONTHS_SQL = (
+    "ALTER TABLE sample ADD COLUMN age_at_collection_months SMALLINT",
+    "UPDATE sample SET age_at_collection_months = round(age_at_collection * 12) "
+    "WHERE round(age_at_collection * 12) BETWEEN 0 AND 32767",
+    "ALTER TABLE sample DROP COLUMN age_at_collection",
+)
+
+
+def migrate_sample_age_months(conn):
+    """
+    Replace sample.age_at_collection (years) by sample.age_at_collection_months.
+    """
+    if column_info(conn, "sample", "age_at_collection") is None:
+        return False
+    for statement in SAMPLE_AGE_MONTHS_SQL:
+        conn.execute(text(statement))
+    return True
+
+
+# ontology_term gets the integer surrogate key term_pk, sample references it instead of
+# the CURIE. term_id stays unique for subject and biological_sex_info
+SAMPLE_TERM_COLUMNS = ("disease", "phenotypic_abnormality", "treatment", "cell_type",
+                       "sampling_site", "condition_under_study")
+ONTOLOGY_TERM_PK_SQL = (
+    "ALTER TABLE ontology_term ADD COLUMN term_pk SERIAL",
+    *(statement.format(name=name) for name in SAMPLE_TERM_COLUMNS for statement in (
+        "ALTER TABLE sample ADD COLUMN {name}_term_pk INTEGER",
+        "UPDATE sample SET {name}_term_pk = o.term_pk "
+        "FROM ontology_term o WHERE o.term_id = sample.{name}_term_id",
+        "ALTER TABLE sample DROP COLUMN {name}_term_id",
+    )),
+    # Drops the foreign keys of subject and biological_sex_info to term_id as well
+    "ALTER TABLE ontology_term DROP CONSTRAINT ontology_term_pkey CASCADE",
+    "ALTER TABLE ontology_term ADD PRIMARY KEY (term_pk)",
+    "ALTER TABLE ontology_term ADD CONSTRAINT ontology_term_term_id_key UNIQUE (term_id)",
+    *(f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_fkey FOREIGN KEY ({column}) "
+      f"REFERENCES ontology_term (term_id) ON DELETE CASCADE"
+      for table, column in (("subject", "ethnicity_term_id"), ("subject", "organism_term_id"),
+                            ("biological_sex_info", "biological_sex_term_id"))),
+    *(statement.format(name=name) for name in SAMPLE_TERM_COLUMNS for statement in (
+        "ALTER TABLE sample ADD CONSTRAINT sample_{name}_term_pk_fkey "
+        "FOREIGN KEY ({name}_term_pk) REFERENCES ontology_term (term_pk) ON DELETE CASCADE",
+        "CREATE INDEX ix_sample_{name}_term_pk ON sample ({name}_term_pk)",
+    )),
+)
+
+
+def migrate_ontology_term_pk(conn):
+    """
+    Add ontology_term.term_pk and replace the *_term_id columns of sample by *_term_pk.
+    """
+    if column_info(conn, "ontology_term", "term_pk") is not None:
+        return False
+    for statement in ONTOLOGY_TERM_PK_SQL:
+        conn.execute(text(statement))
+    return True
+
+
+# Labels are looked up case-insensitively, term_label becomes an indexed CITEXT column
+TERM_LABEL_CITEXT_SQL = (
+    "CREATE EXTENSION IF NOT EXISTS citext",
+    "ALTER TABLE ontology_term ALTER COLUMN term_label TYPE citext",
+    "CREATE INDEX IF NOT EXISTS ix_ontology_term_term_label ON ontology_term (term_label)",
+)
+
+
+def migrate_term_label_citext(conn):
+    """
+    Change ontology_term.term_label to CITEXT and index it.
+    """
+    if column_info(conn, "ontology_term", "term_label")["udt_name"] == "citext":
+        return False
+    for statement in TERM_LABEL_CITEXT_SQL:
+        conn.execute(text(statement))
+    return True
+
+
+# The per-pixel rows of sample_pixel are folded into one sample_pixel_trace row per
+# sample, in pixel order. Values are cast to double precision, so tables that never got
+# the REAL to DOUBLE PRECISION change migrate too
+SAMPLE_PIXEL_TRACE_SQL = (
+    "INSERT INTO sample_pixel_trace (sample_id, pixel_intensity, base_pair_position) "
+    "SELECT sample_id, "
+    "array_agg(pixel_intensity::double precision ORDER BY pixel_order), "
+    "array_agg(base_pair_position::double precision ORDER BY pixel_order) "
+    "FROM sample_pixel GROUP BY sample_id "
+    "ON CONFLICT (sample_id) DO NOTHING",
+    "DROP TABLE sample_pixel",
+)
+
+
+def migrate_sample_pixel_trace(conn):
+    """
+    Move the pixels of the old sample_pixel table into sample_pixel_trace and drop it.
+    """
+    if not inspect(conn).has_table("sample_pixel"):
+        return False
+    SamplePixelTrace.__table__.create(conn, checkfirst=True)
+    for statement in SAMPLE_PIXEL_TRACE_SQL:
+        conn.execute(text(statement))
+    return True
+
+
+# CURIEs are ASCII, the term id columns compare bytes with the "C" collation
+TERM_ID_COLUMNS = (
+    ("ontology_term", "term_id"),
+    ("biological_sex_info", "biological_sex_term_id"),
+    ("subject", "biological_sex_term_id"),
+    ("subject", "ethnicity_term_id"),
+    ("subject", "organism_term_id"),
+)
+TERM_ID_COLLATION_SQL = tuple(
+    f'ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(50) COLLATE "C"'
+    for table, column in TERM_ID_COLUMNS
+)
+
+
+def migrate_term_id_collation(conn):
+    """
+    Give ontology_term.term_id and the columns referencing it the "C" collation.
+    """
+    if column_info(conn, "ontology_term", "term_id")["collation_name"] == "C":
+        return False
+    for statement in TERM_ID_COLLATION_SQL:
+        conn.execute(text(statement))
+    return True
+
+
+# In the order they have to run
+MIGRATIONS = (
+    migrate_biological_sex_term_id,
+    migrate_sample_age_months,
+    migrate_ontology_term_pk,
+    migrate_term_label_citext,
+    migrate_sample_pixel_trace,
+    migrate_term_id_collation,
+)
+
+
+def main():
+    """
+    Run every migration step that the database still needs.
+    """
+    for step in MIGRATIONS:
+        with engine.begin() as conn:
+            applied = step(conn)
+        print(f"{step.__name__}: {'applied' if applied else 'nothing to do'}")
+    print("Database migration completed successfully!")
+
+
+if __name__ == "__main__":
+    main()
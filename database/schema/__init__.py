@@ -1,3 +1,25 @@
-# This empty file makes Python treat this directory (schema) as a package.
+# This file makes Python treat this directory (schema) as a package.
 # Without this we can't import submodules or subpackages using the full dotted path,
 # like "from database.schema.base import Base".
+#
+# All mapped modules are imported here once, so relationship() targets given
+# as strings ("Submission", "Ladder", ...) can always be resolved, whichever
+# schema module is imported first. The modules themselves do not need to
+# import their related classes at the bottom anymore.
+# enum_types registers the creation of the PostgreSQL enum types.
+# pylint: disable=unused-import
+from database.schema import (
+    biological_sex_info,
+    enum_types,
+    file,
+    gel_electrophoresis_devices,
+    ladder,
+    ladder_peak,
+    ladder_pixel,
+    ontology_term,
+    sample,
+    sample_pixel_trace,
+    subject,
+    submission,
+    user_details
+    )
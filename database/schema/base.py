@@ -3,6 +3,16 @@ Defines the SQLAlchemy declarative base. This base class is the parent that all
 representing tables inherit from. This way those classes can represent database tables and
 interact with the database using SQLAlchemy.
 """
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import String
+from sqlalchemy.orm import DeclarativeBase
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """
+    SQLAlchemy 2.0 style declarative base (the tables already use Mapped/mapped_column).
+    Columns without an explicit type get it from their Mapped[...] annotation,
+    plain str columns default to String(50).
+    """
+    type_annotation_map = {
+        str: String(50),
+    }
@@ -9,51 +9,32 @@ find your term in the CV list, please create an issue at our [metadata GitHub re
 (https://github.com/EbiEga/ega-metadata-schema/issues/new/choose) proposing its addition.
 """
 from datetime import datetime
-from sqlalchemy import DateTime, String, ForeignKey
-from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM
+from sqlalchemy import DateTime, String, ForeignKey, func
 from sqlalchemy.orm import Mapped, mapped_column
 from database.schema.base import Base
 
-biological_sex_enum = PG_ENUM(
-    'male',
-    'female',
-    'hermaphrodite',
-    'pseudohermaphrodite',
-    'unknown',
-    name='biological_sex_enum',
-    create_type=True
-)
-
 class BiologicalSexInfo(Base):
     """
-    Represents the 'biological_sex_info' table.
+    Represents the 'biological_sex_info' table, the controlled vocabulary of
+    biological sex terms (male, female, hermaphrodite, pseudohermaphrodite, unknown).
+    The label of each term lives in ontology_term, so no separate enum type is needed.
     Columns:
-    biological_sex : biological_sex_enum (Primary Key)
-        An enumerated type representing the biological sex category.
-        Possible values include: 'male', 'female', 'hermaphrodite',
-        'pseudohermaphrodite', 'unknown'.
-
-    term_id : String(50), ForeignKey to ontology_term.term_id
-        A foreign key linking to the ontology_term table that provides the CURIE identifier 
-        and detailed metadata describing the biological sex term.
+    biological_sex_term_id : String(50) (Primary Key), ForeignKey to ontology_term.term_id
+        The CURIE identifier of the biological sex term, see ontology_term for
+        its label and description.
     created_at : DateTime
         Timestamp when the record was inserted.
     """
     __tablename__ = 'biological_sex_info'
 
-    biological_sex: Mapped[str] = mapped_column(
-        biological_sex_enum,
-        primary_key=True
-    )
-
     biological_sex_term_id: Mapped[str] = mapped_column(
-      String(50),
+      String(50, collation="C"),
       ForeignKey('ontology_term.term_id', ondelete='CASCADE'),
-      nullable=False
+      primary_key=True
     )
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
@@ -0,0 +1,42 @@
+"""
+Creates all PostgreSQL enum types of the schema in one statement.
+The enum columns are declared with create_type=False, otherwise create_all would
+look every type up in pg_type and create it separately. Instead one DO block
+runs before the tables are created and skips the types that already exist.
+"""
+from sqlalchemy import DDL, event
+
+from database.schema.base import Base
+from database.schema.hospitalization_status_enum import hospitalization_status_enum
+from database.schema.in_vitro_in_vivo_enum import in_vitro_in_vivo_enum
+from database.schema.mass_unit_enum import mass_unit_enum
+from database.schema.sample import sample_type_enum
+from database.schema.sample_status_enum import sample_status_enum
+from database.schema.submission import delete_status_enum
+from database.schema.volume_unit_enum import volume_unit_enum
+
+ENUM_TYPES = (
+    delete_status_enum,
+    hospitalization_status_enum,
+    in_vitro_in_vivo_enum,
+    mass_unit_enum,
+    sample_status_enum,
+    sample_type_enum,
+    volume_unit_enum,
+)
+
+
+def create_enum_types_sql(enum_types) -> str:
+    """
+    Build one DO block that creates the given enum types,
+    ignoring the ones that already exist (duplicate_object).
+    """
+    statements = []
+    for enum_type in enum_types:
+        labels = ", ".join("'" + label.replace("'", "''") + "'" for label in enum_type.enums)
+        statements.append(f"    BEGIN CREATE TYPE {enum_type.name} AS ENUM ({labels}); "
+                          f"EXCEPTION WHEN duplicate_object THEN NULL; END;")
+    return "DO $$ BEGIN\n" + "\n".join(statements) + "\nEND $$;"
+
+
+event.listen(Base.metadata, "before_create", DDL(create_enum_types_sql(ENUM_TYPES)))
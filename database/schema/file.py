@@ -5,11 +5,12 @@ Each file belongs to one submission.
 """
 from datetime import datetime
 import uuid
-from sqlalchemy import ForeignKey, String, DateTime
+from sqlalchemy import ForeignKey, String, Text, DateTime, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
 from database.schema.base import Base
+from database.schema.uuid7 import uuid7
 
 class File(Base):
     """
@@ -25,13 +26,14 @@ class File(Base):
     file_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
 
     submission_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("submission.submission_id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     file_name: Mapped[str] = mapped_column(
@@ -39,14 +41,15 @@ class File(Base):
         nullable=False
     )
 
+    # Nested result paths can be longer than a single file name
     relative_path: Mapped[str] = mapped_column(
-        String(255),
+        Text,
         nullable=False
     )
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
     
@@ -54,5 +57,3 @@ class File(Base):
         "Submission",
         back_populates="files"
     )
-
-from database.schema.submission import Submission
@@ -3,7 +3,7 @@ This module defines the 'gel_electrophoresis_devices' table.
 """
 
 from datetime import datetime
-from sqlalchemy import DateTime, String, Integer
+from sqlalchemy import DateTime, String, Integer, func
 from sqlalchemy.orm import Mapped, mapped_column
 from database.schema.base import Base
 
@@ -30,7 +30,7 @@ class GelElectrophoresisDevice(Base):
     )
     
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
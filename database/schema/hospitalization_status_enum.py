@@ -4,7 +4,7 @@ used to describe the condition of an individual at the time
 their sample was collected.
 """
 from enum import Enum
-from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM
 
 class HospitalizationStatusEnum(str, Enum):
     AMBULANT = "Ambulant"
@@ -15,8 +15,9 @@ class HospitalizationStatusEnum(str, Enum):
     INTENSIVE_CARE_UNIT = "Intensive care unit"
     OPERATION_ROOM = "Operation room"
 
-hospitalization_status_enum = SQLEnum(
+# The type is created by database/schema/enum_types.py
+hospitalization_status_enum = PG_ENUM(
     HospitalizationStatusEnum,
     name="hospitalization_status_enum",
-    create_type=True
+    create_type=False
 )
@@ -3,14 +3,15 @@ This module defines the enum to describe if
 a sample was in vivo or in vitro.
 """
 from enum import Enum
-from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM
 
 class InVitroInVivoEnum(str, Enum):
     IN_VITRO = "In vitro"
     IN_VIVO = "In vivo"
 
-in_vitro_in_vivo_enum = SQLEnum(
+# The type is created by database/schema/enum_types.py
+in_vitro_in_vivo_enum = PG_ENUM(
     InVitroInVivoEnum,
     name="in_vitro_in_vivo_enum",
-    create_type=True 
+    create_type=False
 )
@@ -2,7 +2,7 @@
 This module describes all ladders.
 """
 from datetime import datetime
-from sqlalchemy import DateTime, Integer, String
+from sqlalchemy import BigInteger, DateTime, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database.schema.base import Base
 
@@ -13,9 +13,11 @@ class Ladder(Base):
     """
     __tablename__ = 'ladder'
 
-    # Start with 1 increment by 1 for each new ladder
+    # Start with 1 increment by 1 for each new ladder.
+    # bigint like all keys that reference it (ladder_peak, ladder_pixel, sample):
+    # mismatched int4/int8 join keys keep Postgres from using the FK indexes.
     ladder_id: Mapped[int] = mapped_column(
-        Integer,
+        BigInteger,
         primary_key=True,
         autoincrement=True,
     )
@@ -27,24 +29,29 @@ class Ladder(Base):
 
     # Timestamp when the record was inserted.
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
 
     # Relationship between parent (Ladder) and child (LadderPixel) class
     # Create a python attribute ladder_pixels, one ladder (parent)
     # has many pixels (children)
+    # The collections can be large, so they are never loaded implicitly (lazy="raise"):
+    # load them explicitly, e.g. select(Ladder).options(selectinload(Ladder.ladder_pixels)).
+    # passive_deletes lets the ON DELETE CASCADE foreign keys remove the children.
     ladder_pixels: Mapped[list["LadderPixel"]] = relationship(
-        back_populates="ladder"
+        back_populates="ladder",
+        lazy="raise",
+        passive_deletes=True
     )
     ladder_peaks: Mapped[list["LadderPeak"]] = relationship(
-        back_populates="ladder"
+        back_populates="ladder",
+        lazy="raise",
+        passive_deletes=True
     )
     samples: Mapped[list["Sample"]] = relationship(
-        back_populates="ladder"
+        back_populates="ladder",
+        lazy="raise",
+        passive_deletes=True
     )
-
-from database.schema.ladder_pixel import LadderPixel
-from database.schema.ladder_peak import LadderPeak
-from database.schema.sample import Sample
\ No newline at end of file
@@ -2,7 +2,7 @@
 This module describes the gell ladder peaks table.
 """
 from datetime import datetime
-from sqlalchemy import DateTime, Integer, Float, ForeignKey, String
+from sqlalchemy import BigInteger, Boolean, DateTime, Integer, Float, ForeignKey, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database.schema.base import Base
 
@@ -13,16 +13,30 @@ class LadderPeak(Base):
     __tablename__ = 'ladder_peak'
 
     ladder_id: Mapped[int] = mapped_column(
-        Integer,
+        BigInteger,
         ForeignKey("ladder.ladder_id", ondelete="CASCADE"),
         primary_key=True,
         comment="Identifier of the ladder to which this peak belongs."
     )
 
-    peak: Mapped[str] = mapped_column(
-        String(20),
+    peak_order: Mapped[int] = mapped_column(
+        Integer,
         primary_key=True,
-        comment="Order of the peak in the ladder peak input table: Upper_marker,1,2,...,Lower_marker"
+        comment="Row of the peak in the ladder peak input table (Upper_marker,1,2,...,Lower_marker), from 0."
+    )
+
+    is_upper_marker: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        comment="True for the Upper_marker peak."
+    )
+
+    is_lower_marker: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        comment="True for the Lower_marker peak."
     )
 
     basepairs: Mapped[float] = mapped_column(
@@ -38,9 +52,7 @@ class LadderPeak(Base):
 
     # Timestamp when the record was inserted.
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
-
-from database.schema.ladder import Ladder
\ No newline at end of file
@@ -2,7 +2,7 @@
 This module describes ladder pixels.
 """
 from datetime import datetime
-from sqlalchemy import DateTime, Integer, ForeignKey, Numeric
+from sqlalchemy import BigInteger, DateTime, Integer, ForeignKey, Numeric, func, insert
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database.schema.base import Base
 
@@ -14,7 +14,7 @@ class LadderPixel(Base):
     __tablename__ = 'ladder_pixel'
 
     ladder_id: Mapped[int] = mapped_column(
-        Integer,
+        BigInteger,
         ForeignKey("ladder.ladder_id", ondelete="CASCADE"),
         primary_key=True
     )
@@ -40,8 +40,8 @@ class LadderPixel(Base):
 
     # Timestamp when the record was inserted.
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
 
@@ -50,4 +50,13 @@ class LadderPixel(Base):
         back_populates="ladder_pixels"
     )
 
-from database.schema.ladder import Ladder
+    @classmethod
+    def bulk_insert(cls, session, rows):
+        """
+        Insert many pixels of a ladder without creating ORM objects.
+        The list of dicts is sent as one executemany, which SQLAlchemy
+        batches into multi-row INSERT ... VALUES statements.
+        :param rows: list of dicts with the LadderPixel column names as keys
+        """
+        if rows:
+            session.execute(insert(cls), rows)
@@ -3,11 +3,12 @@ This module defines the enum for mass units,
 used to describe the amount of DNA in a sample.
 """
 from enum import Enum
-from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM
 
 class MassUnitEnum(str, Enum):
     PICOGRAM = "pg"
     NANOGRAM = "ng"
     MICROGRAM = "µg"
 
-mass_unit_enum = SQLEnum(MassUnitEnum, name="mass_unit_enum", create_type=True)
+# The type is created by database/schema/enum_types.py
+mass_unit_enum = PG_ENUM(MassUnitEnum, name="mass_unit_enum", create_type=False)
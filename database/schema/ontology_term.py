@@ -4,9 +4,13 @@ https://github.com/EbiEga/ega-metadata-schema/blob/main/schemas/EGA.common-defin
 """
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import DateTime, String
+from sqlalchemy import DDL, CheckConstraint, DateTime, Integer, String, event, func
+from sqlalchemy.dialects.postgresql import CITEXT
 from database.schema.base import Base
 
+# term_label is a CITEXT column
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS citext"))
+
 class OntologyTerm(Base):
     """
     EGA Definition:
@@ -18,8 +22,11 @@ class OntologyTerm(Base):
     (https://phenopacket-schema.readthedocs.io/en/latest/ontologyclass.html)
     
     Columns:
+    - term_pk: Integer surrogate key, referenced by the sample table
+    (a 4 byte key instead of the CURIE string in every sample row and index).
+
     - term_id: The identifier of an ontology term must be in CURIE format (check property
-    'curieGeneralPattern'). Whether a specific term is valid or not according
+    'curieGeneralPattern', enforced by the ck_term_id_curie constraint). Whether a specific term is valid or not according
     to an ontology hierarchy is checked at each specific termId using ontology validation 
     keywords (e.g. 'graphRestriction').
     
@@ -27,6 +34,7 @@ class OntologyTerm(Base):
     It is not required that it matches the label of the termId within the referenced ontology,
     although it should. This is due to the fact that the source of truth will always be the termId,
     and not the label, which adds more context.
+    Stored as CITEXT: labels are looked up case-insensitively, using the index on the column.
 
     - ontology_description: Optional description of the term,
     e.g., from the Ontology Lookup Service (OLS).
@@ -36,13 +44,25 @@ class OntologyTerm(Base):
     Timestamp when the record was inserted.
     """
     __tablename__ = "ontology_term"
+    # CURIE format (prefix:local_id), checked by Postgres on insert
+    __table_args__ = (
+        CheckConstraint(
+            "term_id ~ '^[A-Za-z_][A-Za-z0-9_.-]*:[A-Za-z0-9_.-]+$'",
+            name="ck_term_id_curie"
+        ),
+    )
 
-    term_id: Mapped[str] = mapped_column(String(50), primary_key=True)
-    term_label: Mapped[str] = mapped_column(String(255), nullable=False)
+    term_pk: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # Still unique: subject and biological_sex_info reference the CURIE directly.
+    # CURIEs are ASCII: the "C" collation compares bytes instead of locale rules, and its
+    # B-tree also serves prefix searches (term_id LIKE 'NCIT:%') without varchar_pattern_ops.
+    # The columns referencing term_id use the same collation.
+    term_id: Mapped[str] = mapped_column(String(50, collation="C"), nullable=False, unique=True)
+    term_label: Mapped[str] = mapped_column(CITEXT, nullable=False, index=True)
     ontology_description: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
\ No newline at end of file
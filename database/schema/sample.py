@@ -3,35 +3,28 @@ This module defines the 'sample' table.
 The Sample table stores all samples and all associated metadata is either stored 
 directly in the table or in additional tables that reference its primary key.
 """
-from datetime import datetime
-from typing import List
+from datetime import date, datetime
 from sqlalchemy import (
-    JSON,
-    Boolean,
-    Date,
+    BigInteger,
     DateTime,
-    Float,
-    Integer,
-    String,
+    SmallInteger,
     ForeignKey,
+    Index,
     UUID,
+    func,
+    insert,
+    text,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM
+from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
+from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM, JSONB
 from database.schema.in_vitro_in_vivo_enum import in_vitro_in_vivo_enum
 from database.schema.mass_unit_enum import mass_unit_enum
 from database.schema.volume_unit_enum import volume_unit_enum
 from database.schema.base import Base
 from database.schema.hospitalization_status_enum import hospitalization_status_enum
+from database.schema.sample_status_enum import SampleStatus, sample_status_enum
 
-sample_status_enum = PG_ENUM(
-    'case',
-    'control',
-    'not applicable',
-    name='sample_status_enum',
-    create_type=True
-)
-
+# The type is created by database/schema/enum_types.py
 sample_type_enum = PG_ENUM(
     "DNA",
     "RNA",
@@ -53,7 +46,7 @@ sample_type_enum = PG_ENUM(
     "biofilm",
     "tissue culture",
     name="sample_type_enum",
-    create_type=True
+    create_type=False
 )
 
 class Sample(Base):
@@ -98,7 +91,7 @@ class Sample(Base):
       https://www.ebi.ac.uk/ols/ontologies/ncbitaxon).
       You can find further details at 'https://www.uniprot.org/help/taxonomic_identifier'.
       This is appropriate for individual organisms and some environmental samples.
-    - disease_term_id: https://github.com/EbiEga/ega-metadata-schema/blob/main/schemas/EGA.common-definitions.json
+    - disease_term_pk: https://github.com/EbiEga/ega-metadata-schema/blob/main/schemas/EGA.common-definitions.json
         EGA Definition:
         Property to describe a 'disease' (i.e. a disposition to undergo pathological processes because
         of one or more disorders). Ontology constraints for this specific termId:
@@ -109,14 +102,14 @@ class Sample(Base):
         - In case the phenotypic abnormality is unknown or there is none:
         * Unknown - NCIT:C17998
         * Unaffected - NCIT:C9423
-    - phenotypic_abnormality_term_id: https://github.com/EbiEga/ega-metadata-schema/blob/main/schemas/EGA.common-definitions.json
+    - phenotypic_abnormality_term_pk: https://github.com/EbiEga/ega-metadata-schema/blob/main/schemas/EGA.common-definitions.json
         EGA Definition:
         Property to describe any abnormal (i.e. deviation from normal or average) phenotype
         (i.e. detectable outward manifestations of a specific genotype).
         In case the phenotypic abnormality is:
         "NCIT:C17998": "Unknown",
         "NCIT:C94232": "Unaffected"
-    - cell_type_term_id
+    - cell_type_term_pk
     - sample_type: the material entity (e.g. DNA) that is this sample.
       Use this property as tags that befit your sample, picking as many as needed.
       Choose the specific terms if possible (e.g. if the assayed molecule is cDNA,
@@ -132,11 +125,11 @@ class Sample(Base):
     - sample_collection_date: Date when the sample was collected (e.g. '2021-05-15').
     If the protocols are too long, the date shall be the day the collection concluded.
 
-    - age_at_collection: Precise age in float format in years (20.5 years)
-    EGA requires in ISO8601 format. For example, 'P3Y6M4D'
+    - age_at_collection_months: Age in whole months (20.5 years are stored as 246),
+    the metadata form takes it in years. EGA requires in ISO8601 format. For example, 'P3Y6M4D'
     represents a duration of three years, six months and four days.
 
-    - sampling_site_term_id(materialAnatomicalEntity): A site or entity from which a sample
+    - sampling_site_term_pk(materialAnatomicalEntity): A site or entity from which a sample
       (i.e. a statistically 
     representative of the whole) is extracted from the whole. Search for your sample collection
     site at http://purl.obolibrary.org/obo/UBERON_0000465. For example: in the case of a nasal swab,
@@ -144,7 +137,7 @@ class Sample(Base):
 
     ---------sampleStatus-------------
     - case_vs_control
-    - condition_under_study_term_id
+    - condition_under_study_term_pk
     Statuses of the sample. Used to specify the condition(s) under study **if** the diagnosis of 
     the individual is not enough to describe the status of the sample. In other words, 
     if the differenciation between affected and unaffected groups is done at the
@@ -189,22 +182,45 @@ class Sample(Base):
    - in_vitro_in_vivo: in vivo if the sample was directly extracted from a living organism, 
      otherwise if it came from a lab setup it is in vitro.
 
-   - treatment_term_id: Medications the patient used.
+   - treatment_term_pk: Medications the patient used.
 
    - created_at : DateTime
      Timestamp when the record was inserted.
     """
 
     __tablename__ = 'sample'
+    # Samples are read per submission, ordered by sample_id: the covering index holds
+    # the columns shown for a submission, so the list is read from the index alone
+    # (index-only scan, no heap lookup per sample). ladder_id is included for the
+    # (submission_id, ladder_id) filters.
+    # The other foreign keys get their own index (index=True).
+    # The boolean flags are mostly NULL/False: partial indexes only keep the True rows.
+    __table_args__ = (
+        Index("ix_sample_submission_covering", "submission_id", "sample_id",
+              postgresql_include=["sample_name", "ladder_id", "subject_id", "case_vs_control"]),
+        Index("ix_sample_infection_suspected_true", "sample_id",
+              postgresql_where=text("is_infection_suspected = true")),
+        Index("ix_sample_pregnant_true", "sample_id",
+              postgresql_where=text("is_pregnant = true")),
+        Index("ix_sample_deceased_true", "sample_id",
+              postgresql_where=text("is_deceased = true")),
+        # Tag-value lookups (custom_sample_attributes @> '{"tag": "value"}')
+        Index("ix_sample_custom_attrs_gin", "custom_sample_attributes", postgresql_using="gin"),
+    )
+    # Do not fetch server defaults (created_at) back after a flush, and do not
+    # check the row count of DELETEs (rows are also removed by ON DELETE CASCADE)
+    __mapper_args__ = {
+        "eager_defaults": False,
+        "confirm_deleted_rows": False,
+    }
 
     sample_id: Mapped[int] = mapped_column(
-      Integer,
+      BigInteger,
       primary_key=True,
       autoincrement=True
     )
 
     sample_name: Mapped[str] = mapped_column(
-      String(50),
       nullable=False
     )
 
@@ -216,9 +232,10 @@ class Sample(Base):
     
     # ---------ladder table-------------
     ladder_id: Mapped[int] = mapped_column(
-        Integer,
+        BigInteger,
         ForeignKey('ladder.ladder_id', ondelete='CASCADE'),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     # ---------subject table-------------
@@ -226,35 +243,37 @@ class Sample(Base):
     subject_id: Mapped[str] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey('subject.subject_id', ondelete='CASCADE'),
-        nullable=True
+        nullable=True,
+        index=True
     )
     
+    # The ontology terms are referenced by their integer term_pk (see ontology_term)
     # ---------Disease-------------
-    disease_term_id: Mapped[str] = mapped_column(
-        String(50),
-        ForeignKey('ontology_term.term_id', ondelete='CASCADE'),
-        nullable=True
+    disease_term_pk: Mapped[int | None] = mapped_column(
+        ForeignKey('ontology_term.term_pk', ondelete='CASCADE'),
+        nullable=True,
+        index=True
     )
     
     # ---------Phenotypic Abnormality-------------
-    phenotypic_abnormality_term_id: Mapped[str] = mapped_column(
-        String(50),
-        ForeignKey('ontology_term.term_id', ondelete='CASCADE'),
-        nullable=True
+    phenotypic_abnormality_term_pk: Mapped[int | None] = mapped_column(
+        ForeignKey('ontology_term.term_pk', ondelete='CASCADE'),
+        nullable=True,
+        index=True
     )
 
     # ---------Treatment-------------
-    treatment_term_id: Mapped[str] = mapped_column(
-        String(50),
-        ForeignKey('ontology_term.term_id', ondelete='CASCADE'),
-        nullable=True
+    treatment_term_pk: Mapped[int | None] = mapped_column(
+        ForeignKey('ontology_term.term_pk', ondelete='CASCADE'),
+        nullable=True,
+        index=True
     )
 
     # ---------Cell Type-------------
-    cell_type_term_id: Mapped[str] = mapped_column(
-        String(50),
-        ForeignKey('ontology_term.term_id', ondelete='CASCADE'),
-        nullable=True
+    cell_type_term_pk: Mapped[int | None] = mapped_column(
+        ForeignKey('ontology_term.term_pk', ondelete='CASCADE'),
+        nullable=True,
+        index=True
     )
     
     # ---------Sample Type-------------
@@ -264,22 +283,22 @@ class Sample(Base):
     )
 
     # ---------sampleCollection fields-------------
-    sample_collection_date: Mapped[Date | None] = mapped_column(
-        Date,
+    sample_collection_date: Mapped[date | None] = mapped_column(
         nullable=True,
         comment="Date when the sample was collected"
     )
 
-    age_at_collection: Mapped[str | None] = mapped_column(
-        Float,
+    # Months fit in 2 bytes, a Float age in years takes 8
+    age_at_collection_months: Mapped[int | None] = mapped_column(
+        SmallInteger,
         nullable=True
     )
 
     # Sampling site (materialAnatomicalEntity) using UBERON
-    sampling_site_term_id: Mapped[str | None] = mapped_column(
-        String(50),
-        ForeignKey('ontology_term.term_id', ondelete='CASCADE'),
+    sampling_site_term_pk: Mapped[int | None] = mapped_column(
+        ForeignKey('ontology_term.term_pk', ondelete='CASCADE'),
         nullable=True,
+        index=True,
         comment=(
             "UBERON term representing the site where the sample was collected"
             "(e.g., 'nasal cavity', 'liver')"
@@ -287,22 +306,24 @@ class Sample(Base):
     )
 
     # ---------sampleStatus-------------
-    case_vs_control: Mapped[str] = mapped_column(
+    case_vs_control: Mapped[SampleStatus | None] = mapped_column(
         sample_status_enum,
         nullable=True,
         comment="Whether the sample is a 'case', 'control', or 'not applicable'."
     )
 
-    condition_under_study_term_id: Mapped[str] = mapped_column(
-        String(50),
-        ForeignKey('ontology_term.term_id', ondelete='CASCADE'),
+    condition_under_study_term_pk: Mapped[int | None] = mapped_column(
+        ForeignKey('ontology_term.term_pk', ondelete='CASCADE'),
         nullable=True,
+        index=True,
         comment="Ontology term ID for the condition under study."
     )
     
     # --------- Custom Sample Attributes (sampleAttributes) -------------
+    # JSONB is stored parsed and can be GIN indexed (ix_sample_custom_attrs_gin)
+    # none_as_null: None is stored as SQL NULL, not as the JSON value null
     custom_sample_attributes: Mapped[dict | None] = mapped_column(
-        JSON,
+        JSONB(none_as_null=True),
         nullable=True,
         comment=(
             "Custom attributes of a sample: reusable attributes to encode tag-value pairs (e.g. Tag being 'age' and its Value '30') with optional units (e.g. 'years')"
@@ -313,23 +334,19 @@ class Sample(Base):
     # --------- sampleAttributes-------------
     #dead: PATO:0001422, alive:  PATO:0001421
     is_deceased: Mapped[bool | None] = mapped_column(
-        Boolean,
         nullable=True
     )
 
     is_pregnant: Mapped[bool | None] = mapped_column(
-        Boolean,
         nullable=True
     )
 
-    is_infection_suspected: Mapped[str | None]= mapped_column(
-        Boolean,
+    is_infection_suspected: Mapped[bool | None] = mapped_column(
         nullable=True,
         comment= "Is True if a sepsis or a bacterial infection is suspected, otherwise False."
     )
 
     infection_strain: Mapped[str | None] = mapped_column(
-        String(50),
         nullable=True,
         comment="Specify the strain involved if infection is suspected."
     )
@@ -340,14 +357,12 @@ class Sample(Base):
         comment="Status of hospitalization for the individual."
     )
 
-    extraction_kit: Mapped[str | None] =  mapped_column(
-        String(50),
+    extraction_kit: Mapped[str | None] = mapped_column(
         nullable=True,
         comment="Extraction kit used."
     )
 
     dna_mass: Mapped[float | None] = mapped_column(
-        Float,
         nullable=True,
         comment="DNA amount numeric value."
     )
@@ -361,7 +376,6 @@ class Sample(Base):
 
     # Volume of liquid carrying the DNA/RNA
     carrying_liquid_volume: Mapped[float | None] = mapped_column(
-        Float,
         nullable=True,
         comment="Volume of DNA carrying liquid (numeric)."
     )
@@ -379,16 +393,16 @@ class Sample(Base):
         comment="Indicates whether the sample originated from an in vitro or in vivo source."
     )
 
-    gel_electrophoresis_device_id: Mapped[int] = mapped_column(
-        Integer,
+    gel_electrophoresis_device_id: Mapped[int | None] = mapped_column(
         ForeignKey("gel_electrophoresis_devices.device_id", ondelete="CASCADE"),
         nullable=True,
+        index=True,
         comment="Reference to the gel electrophoresis device used."
     )
     
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
 
@@ -397,10 +411,45 @@ class Sample(Base):
     # Parent: sample
     # Child: sample_treatment
     # https://docs.sqlalchemy.org/en/20/orm/basic_relationships.html
-    ladder: Mapped["Ladder"] = relationship(back_populates="samples")
-    sample_pixels: Mapped[List["SamplePixel"]] = relationship(back_populates="sample")
+    # Every sample of a submission uses the same small ladder row: load it in the same
+    # SELECT (inner join, ladder_id is NOT NULL) instead of one query per sample
+    ladder: Mapped["Ladder"] = relationship(
+        back_populates="samples",
+        lazy="joined",
+        innerjoin=True
+    )
+    # Like the ladder collections the pixel trace is never loaded implicitly (no N+1 per sample):
+    # load it in one IN query with select(Sample).options(selectinload(Sample.pixel_trace)).
+    pixel_trace: Mapped["SamplePixelTrace"] = relationship(
+        back_populates="sample",
+        uselist=False,
+        lazy="raise",
+        passive_deletes=True
+    )
     submission: Mapped["Submission"] = relationship("Submission", back_populates="samples")
 
-from database.schema.ladder import Ladder
-from database.schema.sample_pixel import SamplePixel
-from database.schema.submission import Submission
+    @classmethod
+    def default_read_options(cls):
+        """
+        Loader options for reading whole samples, e.g.
+        select(Sample).options(*Sample.default_read_options()).
+        The pixel traces of all selected samples are loaded in one extra IN query
+        (pixel_trace is never loaded implicitly), the ladder is joined already.
+        """
+        return (selectinload(cls.pixel_trace),)
+
+    @classmethod
+    def bulk_insert(cls, session, rows):
+        """
+        Insert many samples without creating ORM objects, batched into
+        multi-row INSERT ... VALUES statements.
+        :param rows: list of dicts with the Sample column names as keys
+        (the same keys in every row, so they go into the same batches)
+        :return: list of the new sample_ids, in the order of rows
+        """
+        if not rows:
+            return []
+        return list(session.scalars(
+            insert(cls).returning(cls.sample_id, sort_by_parameter_order=True),
+            rows
+        ))
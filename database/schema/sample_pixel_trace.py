@@ -0,0 +1,61 @@
+"""
+This module stores the sample pixel traces table.
+"""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import BigInteger, DateTime, Double, ForeignKey, func, insert
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from database.schema.base import Base
+
+
+class SamplePixelTrace(Base):
+    """
+    This table stores the pixels of each sample (gel lane) from the input gel
+    electrophoresis image, one row per sample.
+    primary key is sample_id.
+    The position in the arrays is the sequential order of the pixel in the gel image:
+    a lane is always read and written as a whole, so it is stored as one row with
+    two packed arrays instead of one row (and index entry) per pixel.
+    """
+    __tablename__ = 'sample_pixel_trace'
+    sample_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("sample.sample_id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # DOUBLE PRECISION keeps the ~15 digits DNAvi writes, elements are NULL for empty cells
+    pixel_intensity: Mapped[List[Optional[float]]] = mapped_column(
+        ARRAY(Double, dimensions=1),
+        nullable=False,
+        comment="Measured intensity of each pixel, in pixel order."
+    )
+
+    base_pair_position: Mapped[List[Optional[float]]] = mapped_column(
+        ARRAY(Double, dimensions=1),
+        nullable=False,
+        comment="Translation of each pixel intensity into fragment size (base pairs), in pixel order."
+    )
+
+    # Timestamp when the record was inserted.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+    # Relationships
+    sample: Mapped["Sample"] = relationship(
+        back_populates="pixel_trace"
+    )
+
+    @classmethod
+    def bulk_insert(cls, session, rows):
+        """
+        Insert the traces of many samples without creating ORM objects,
+        batched into multi-row INSERT ... VALUES statements.
+        :param rows: list of dicts with keys sample_id, pixel_intensity, base_pair_position
+        """
+        if rows:
+            session.execute(insert(cls), rows)
@@ -0,0 +1,20 @@
+"""
+This module defines the enum for the sample status,
+used to describe whether a sample is a case or a control.
+"""
+from enum import Enum
+from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM
+
+class SampleStatus(str, Enum):
+    CASE = "case"
+    CONTROL = "control"
+    NOT_APPLICABLE = "not applicable"
+
+# The type is created by database/schema/enum_types.py
+# The database labels are the values ('case', ...), not the member names
+sample_status_enum = PG_ENUM(
+    SampleStatus,
+    name="sample_status_enum",
+    values_callable=lambda status: [member.value for member in status],
+    create_type=False
+)
@@ -5,12 +5,12 @@ is either stored directly in the table or in additional tables that reference it
 """
 from datetime import datetime
 import uuid
-from sqlalchemy import DateTime, String, ForeignKey
+from sqlalchemy import DateTime, String, ForeignKey, func
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 
 from database.schema.base import Base
-from database.schema.biological_sex_info import biological_sex_enum
+from database.schema.uuid7 import uuid7
 
 class Subject(Base):
     """
@@ -26,7 +26,7 @@ class Subject(Base):
     'disease' arrays will contain a reference to 'Unaffected' [NCIT:C94232]. Do take into
     account the 'excluded' property of each 'disease' or 'phenotypicAbnormality' in order
     to evaluate it correctly, since logic negation can be provided using that property.
-    - biological_sex
+    - biological_sex_term_id: ontology term of the biological sex (see biological_sex_info)
     - ethnicity_term_id
     ---------organismDescriptor-------------
     EGA: This property describes the material entity 
@@ -51,7 +51,7 @@ class Subject(Base):
     subject_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
 
     subject_name: Mapped[str] = mapped_column(
@@ -59,29 +59,32 @@ class Subject(Base):
         nullable=True
     )
 
-    biological_sex: Mapped[str] = mapped_column(
-        biological_sex_enum,
-        ForeignKey("biological_sex_info.biological_sex", ondelete="CASCADE"),
-        nullable=True
+    biological_sex_term_id: Mapped[str] = mapped_column(
+        String(50, collation="C"),
+        ForeignKey("biological_sex_info.biological_sex_term_id", ondelete="CASCADE"),
+        nullable=True,
+        index=True
     )
 
     ethnicity_term_id: Mapped[str] = mapped_column(
-        String(50),
+        String(50, collation="C"),
         ForeignKey('ontology_term.term_id', ondelete='CASCADE'),
-        nullable=True
+        nullable=True,
+        index=True
     )
     
     # ---------organismDescriptor fields-------------
     # organismDescriptor.organismTaxon
     organism_term_id: Mapped[str] = mapped_column(
-        String(50),
+        String(50, collation="C"),
         ForeignKey('ontology_term.term_id', ondelete='CASCADE'),
-        nullable=True
+        nullable=True,
+        index=True
     )
     
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
 
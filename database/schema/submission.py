@@ -4,12 +4,14 @@ The submission table stores all submissions of a specific user.
 """
 from datetime import datetime
 import enum
+from typing import List
 import uuid
-from sqlalchemy import DateTime, Enum, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM, UUID
 
 from database.schema.base import Base
+from database.schema.uuid7 import uuid7
 
 class DeleteStatus(enum.Enum):
     """
@@ -18,6 +20,9 @@ class DeleteStatus(enum.Enum):
     NONE = "none"        # default: not requested
     PENDING = "pending"  # user requested deletion
 
+# The type is created by database/schema/enum_types.py
+delete_status_enum = PG_ENUM(DeleteStatus, name="delete_status_enum", create_type=False)
+
 class Submission(Base):
     """
     - submission_id (output_id): Each submission to DNAvi
@@ -32,24 +37,25 @@ class Submission(Base):
     submission_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4
+        default=uuid7
     )
 
     username: Mapped[str] = mapped_column(
         String(50),
         ForeignKey('user_details.username', ondelete='CASCADE'),
-        nullable=False
+        nullable=False,
+        index=True
     )
     
     delete_status: Mapped[DeleteStatus] = mapped_column(
-        Enum(DeleteStatus, name="delete_status_enum"),
+        delete_status_enum,
         default=DeleteStatus.NONE,
         nullable=False
     )
     
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
     
@@ -58,10 +64,21 @@ class Submission(Base):
     # Parent: user
     # Child: submission
     # https://docs.sqlalchemy.org/en/20/orm/basic_relationships.html
-    user: Mapped["UserDetails"] = relationship(back_populates="submissions")
-    files: Mapped["File"] = relationship(back_populates="submission")
-    samples: Mapped["Sample"] = relationship(back_populates="submission")
-
-from database.schema.file import File
-from database.schema.sample import Sample
-from database.schema.user_details import UserDetails
+    # The user row is small and always exists (username is NOT NULL): load it in the
+    # same SELECT. The collections are never loaded implicitly (no N+1 per submission),
+    # load them explicitly, e.g. select(Submission).options(selectinload(Submission.files)).
+    user: Mapped["UserDetails"] = relationship(
+        back_populates="submissions",
+        lazy="joined",
+        innerjoin=True
+    )
+    files: Mapped[List["File"]] = relationship(
+        back_populates="submission",
+        lazy="raise",
+        passive_deletes=True
+    )
+    samples: Mapped[List["Sample"]] = relationship(
+        back_populates="submission",
+        lazy="raise",
+        passive_deletes=True
+    )
@@ -3,11 +3,16 @@ This module describes user details of the submitter of the samples.
 """
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import Boolean, DateTime, String
+from sqlalchemy import Boolean, DateTime, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from werkzeug.security import generate_password_hash, check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from werkzeug.security import check_password_hash
 from database.schema.base import Base
 
+# Argon2 (C implementation) for new hashes, werkzeug hashes are still accepted
+PASSWORD_HASHER = PasswordHasher()
+
 class UserDetails(Base):
     """
     This table describes user details of the submitter of the samples.
@@ -19,22 +24,33 @@ class UserDetails(Base):
     __tablename__ = "user_details"
 
     username: Mapped[Optional[str]] = mapped_column(String(50), primary_key=True)
-    password_hash: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    password_hash: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     is_guest: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.now(),
+        DateTime(timezone=True),
+        server_default=func.now(),
         nullable=False
     )
     
     # Relationship — One user can submit many times (one to many)
-    submissions: Mapped[List["Submission"]] = relationship(back_populates="user")
+    # Never loaded implicitly: the user is loaded on every request (login), its
+    # submissions only when asked for, e.g. selectinload(UserDetails.submissions).
+    submissions: Mapped[List["Submission"]] = relationship(
+        back_populates="user",
+        lazy="raise",
+        passive_deletes=True
+    )
     
     def set_password(self, password: str):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = PASSWORD_HASHER.hash(password)
 
     def check_password(self, password: str) -> bool:
-        return self.password_hash and check_password_hash(self.password_hash, password)
-
-# This line makes sure SQLAlchemy can find the Submission class
-from database.schema.submission import Submission
+        if not self.password_hash:
+            return False
+        # Hashes created before the switch to argon2 (werkzeug pbkdf2/scrypt)
+        if not self.password_hash.startswith("$argon2"):
+            return check_password_hash(self.password_hash, password)
+        try:
+            return PASSWORD_HASHER.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
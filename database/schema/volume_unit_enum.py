@@ -3,15 +3,16 @@ This module defines the enum for volume units,
 used to describe the volume of a carrying liquid in a sample.
 """
 from enum import Enum
-from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import ENUM as PG_ENUM
 
 class VolumeUnitEnum(str, Enum):
     MICROLITER = "µL"
     MILLILITER = "mL"
     LITER = "L"
 
-volume_unit_enum = SQLEnum(
+# The type is created by database/schema/enum_types.py
+volume_unit_enum = PG_ENUM(
     VolumeUnitEnum,
     name="volume_unit_enum",
-    create_type=True
+    create_type=False
 )
@@ -0,0 +1,137 @@
+"""
+Default values (controlled vocabularies) the database is seeded with.
+Each seeder takes an open session and does not commit, so the caller
+decides about the transaction.
+"""
+import csv
+import io
+from sqlalchemy import Table, text
+from sqlalchemy.orm import Session
+from database.schema.biological_sex_info import BiologicalSexInfo
+from database.schema.gel_electrophoresis_devices import GelElectrophoresisDevice
+from database.schema.ontology_term import OntologyTerm
+
+# Seed payloads are plain tuples, built once at import
+ONTOLOGY_TERM_COLUMNS = ("term_label", "term_id", "ontology_description")
+ONTOLOGY_TERM_ROWS = (
+    (
+        "male",
+        "PATO:0000384",
+        "A biological sex quality inhering in an individual or a population whose sex organs contain only male gametes.",
+    ),
+    (
+        "female",
+        "PATO:0000383",
+        "A biological sex quality inhering in an individual or a population that only produces gametes that can be fertilised by male gametes.",
+    ),
+    (
+        "hermaphrodite",
+        "PATO:0001340",
+        "An organism having both male and female sexual characteristics and organs.",
+    ),
+    (
+        "pseudohermaphrodite",
+        "PATO:0001827",
+        "Having internal reproductive organs of one sex and external sexual characteristics of the other sex.",
+    ),
+    (
+        "unknown",
+        "NCIT:C17998",
+        "The biological sex is unknown, not assessed or not available.",
+    ),
+)
+
+# Biological sex terms allowed for subjects (labels are in ONTOLOGY_TERM_ROWS)
+SEX_INFO_COLUMNS = ("biological_sex_term_id",)
+SEX_INFO_ROWS = (
+    ("PATO:0000384",),
+    ("PATO:0000383",),
+    ("PATO:0001340",),
+    ("PATO:0001827",),
+    ("NCIT:C17998",),
+)
+
+GEL_ELECTROPHORESIS_DEVICES_COLUMNS = ("device_name",)
+GEL_ELECTROPHORESIS_DEVICES_ROWS = (
+    ("2100 Bioanalyzer Instrument, Agilent",),
+    ("4150 TapeStation System, Agilent",),
+    ("4200 TapeStation System, Agilent",),
+    ("5200 Fragment Analyzer System, Agilent",),
+    ("5300 Fragment Analyzer System, Agilent",),
+    ("5400 Fragment Analyzer System, Agilent",),
+    ("Qsep 1 Bio-Fragment Analyzer, Nippon",),
+    ("Qsep 100 Bio-Fragment Analyzer, Nippon",),
+    ("Qsep 400 Bio-Fragment Analyzer, Nippon",),
+)
+
+
+def copy_rows(session: Session, table: Table, columns: tuple, rows: tuple,
+              key_columns: list[str]):
+    """
+    Load rows (tuples in the order of columns) with COPY into a temporary staging
+    table and insert them from there, skipping rows that already exist. COPY avoids
+    parsing and planning an INSERT per row, which matters once the vocabularies grow.
+    The staging table is dropped at the end of the transaction.
+    """
+    staging = f"tmp_{table.name}"
+    col_list = ", ".join(columns)
+    # created_at is set explicitly for tables created before it had a server default
+    target_cols, select_cols = col_list, col_list
+    if "created_at" in table.c and "created_at" not in columns:
+        target_cols += ", created_at"
+        select_cols += ", now()"
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(rows)
+    buffer.seek(0)
+
+    session.execute(text(f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                         f"SELECT {col_list} FROM {table.name} WITH NO DATA"))
+    cursor = session.connection().connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {staging} ({col_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+    # NOT EXISTS instead of ON CONFLICT: existing rows are filtered out by the
+    # anti-join, so no speculative insert has to be written and aborted for them
+    match = " AND ".join(f"t.{c} = s.{c}" for c in key_columns)
+    session.execute(text(f"INSERT INTO {table.name} ({target_cols}) "
+                         f"SELECT {select_cols} FROM {staging} s "
+                         f"WHERE NOT EXISTS (SELECT 1 FROM {table.name} t WHERE {match})"))
+
+
+def seed_ontology_terms(session: Session):
+    """
+    Seed the biological sex terms in the ontology_term table.
+    """
+    copy_rows(session, OntologyTerm.__table__, ONTOLOGY_TERM_COLUMNS, ONTOLOGY_TERM_ROWS,
+              ["term_id"])
+
+
+def seed_sex_info(session: Session):
+    """
+    Seed the biological_sex_info table (needs the ontology terms).
+    """
+    copy_rows(session, BiologicalSexInfo.__table__, SEX_INFO_COLUMNS, SEX_INFO_ROWS,
+              ["biological_sex_term_id"])
+
+
+def seed_devices(session: Session):
+    """
+    Seed the gel_electrophoresis_devices table.
+    """
+    copy_rows(session, GelElectrophoresisDevice.__table__, GEL_ELECTROPHORESIS_DEVICES_COLUMNS,
+              GEL_ELECTROPHORESIS_DEVICES_ROWS, ["device_name"])
+
+
+def seed_default_values(session: Session):
+    """
+    Run all seeders in one transaction (committed by the caller).
+    The seed is idempotent, so the commit does not need to wait for the
+    WAL flush: if the server crashes before it, the seed is simply re-run.
+    """
+    session.execute(text("SET LOCAL synchronous_commit = off"))
+    seed_ontology_terms(session)
+    seed_sex_info(session)
+    seed_devices(session)
@@ -0,0 +1,18 @@
+"""
+Shared pytest setup.
+The modules under test build the SQLAlchemy engine at import. Without a .env the
+DNAVI_DB_* settings are unset and the URL cannot even be parsed, so placeholders
+are used for the unit tests (no connection is opened). Values from .env win.
+"""
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+load_dotenv()
+for name, value in (("DNAVI_DB_USER", "dnavi"), ("DNAVI_DB_PASSWORD", "dnavi"),
+                    ("DNAVI_DB_HOST", "localhost"), ("DNAVI_DB_PORT", "5432"),
+                    ("DNAVI_DB_NAME", "dnavi")):
+    os.environ.setdefault(name, value)
@@ -0,0 +1,146 @@
+"""
+Unit tests for the pure helpers of client/db_utils.py (no database needed).
+Run: PYTHONPATH=$(pwd) pytest tests/test_db_utils.py
+"""
+import math
+import re
+
+import pytest
+
+from client import db_utils
+from database.schema.ontology_term import OntologyTerm
+
+
+def curie_constraint_pattern():
+    (constraint,) = [c for c in OntologyTerm.__table__.constraints
+                     if c.name == "ck_term_id_curie"]
+    return re.search(r"'(.*)'", str(constraint.sqltext)).group(1)
+
+
+def test_curie_re_matches_the_check_constraint():
+    # Same pattern as ck_term_id_curie, only the anchors differ (fullmatch)
+    assert curie_constraint_pattern() == f"^{db_utils.CURIE_RE.pattern}$"
+
+
+@pytest.mark.parametrize("term_id, valid", [
+    ("NCIT:C17998", True),
+    ("MONDO:0100096", True),
+    ("NCBITaxon:9606", True),
+    ("EFO:0000001", True),
+    ("_x:y", True),
+    ("http://purl.obolibrary.org/obo/MONDO_0100096", False),
+    ("MONDO_0100096", False),
+    ("NCIT:", False),
+    (":C17998", False),
+    ("1NCIT:C1", False),
+    ("NCIT:C 17998", False),
+    ("NCIT:C1(2)", False),
+])
+def test_curie_re(term_id, valid):
+    constraint_re = re.compile(curie_constraint_pattern())
+    assert bool(db_utils.CURIE_RE.fullmatch(term_id)) is valid
+    assert bool(constraint_re.search(term_id)) is valid
+
+
+@pytest.mark.parametrize("label, term_id", [
+    ("female", "PATO:0000383"),
+    (" Male ", "PATO:0000384"),
+    ("HERMAPHRODITE", "PATO:0001340"),
+    ("unknown", "NCIT:C17998"),
+    ("other", None),
+    ("", None),
+    (None, None),
+])
+def test_map_biological_sex(label, term_id):
+    assert db_utils.map_biological_sex(label) == term_id
+
+
+@pytest.mark.parametrize("age, months", [
+    (None, None),
+    (math.nan, None),
+    ("3", 36),
+    (2.5, 30),
+    (0, 0),
+    (-1, None),
+    (3000, None),
+    (math.inf, None),
+    ("abc", None),
+    ("1e400", None),
+])
+def test_age_to_months(age, months):
+    assert db_utils.age_to_months(age) == months
+
+
+class DeviceSession:
+    """
+    Minimal stand-in for the two statements save_devices runs: the lower(name) IN
+    lookup and the INSERT ... RETURNING of the new devices.
+    """
+    def __init__(self, stored):
+        self.stored = dict(stored)  # {device_name: device_id}
+        self.inserted = []
+
+    def execute(self, stmt, params=None):
+        if params is None:
+            (keys,) = [v for v in stmt.compile().params.values() if isinstance(v, list)]
+            return [(device_id, name.lower()) for name, device_id in self.stored.items()
+                    if name.lower() in keys]
+        rows = []
+        for row in params:
+            self.inserted.append(row["device_name"])
+            device_id = len(self.stored) + 1
+            self.stored[row["device_name"]] = device_id
+            rows.append((device_id, row["device_name"]))
+        return rows
+
+
+def test_save_devices_deduplicates_case_insensitively(tmp_path):
+    metadata_path = tmp_path / "meta.csv"
+    metadata_path.write_text(
+        "SAMPLE,Gel Electrophoresis Device\n"
+        "s1,4150 TapeStation System; New Device\n"
+        "s2,new device\n"
+        "s3,4150 tapestation system\n"
+        "s4,\n"
+    )
+    session = DeviceSession({"4150 TapeStation System": 7})
+    mapping = db_utils.save_devices(session, str(metadata_path))["Gel Electrophoresis Device"]
+    # Only one insert for the two spellings of the new device, none for the stored one
+    assert session.inserted == ["New Device"]
+    assert mapping == {
+        "4150 TapeStation System": 7,
+        "4150 tapestation system": 7,
+        "New Device": 2,
+        "new device": 2,
+    }
+
+
+def test_save_devices_without_device_column(tmp_path):
+    metadata_path = tmp_path / "meta.csv"
+    metadata_path.write_text("SAMPLE\ns1\n")
+    assert db_utils.save_devices(DeviceSession({}), str(metadata_path)) is None
+
+
+class TermSession:
+    def __init__(self, rows):
+        self.info = {}
+        self.rows = rows
+        self.queries = 0
+
+    def execute(self, stmt):
+        self.queries += 1
+        return list(self.rows)
+
+
+def test_term_ids_are_cached_only_after_publish(monkeypatch):
+    monkeypatch.setattr(db_utils, "TERM_ID_CACHE", {})
+    monkeypatch.setitem(db_utils.TERM_CACHES, "term_id", db_utils.TERM_ID_CACHE)
+    session = TermSession([("Lung Cancer", "MONDO:0008903")])
+    assert db_utils.fetch_term_ids(session, ["lung cancer", "other"]) == {"lung cancer": "MONDO:0008903"}
+    # Not shared before the commit, but reused within the same save
+    assert db_utils.TERM_ID_CACHE == {}
+    assert db_utils.fetch_term_ids(session, ["Lung Cancer"]) == {"lung cancer": "MONDO:0008903"}
+    assert session.queries == 1
+    db_utils.publish_term_caches(session)
+    assert db_utils.TERM_ID_CACHE == {"lung cancer": "MONDO:0008903"}
+    assert db_utils.fetch_term_ids(TermSession([]), ["LUNG CANCER"]) == {"lung cancer": "MONDO:0008903"}
@@ -178,7 +178,7 @@ def test_protect_invalid_disease(client):
         samples_count = db.query(Sample).filter_by(submission_id=submission_id).count()
         assert samples_count == 6
         # Check that the invalid diseases were not saved at all in the sample table (ALL NONE)
-        diseases = db.query(Sample.disease_term_id).filter_by(submission_id=submission_id).distinct().all()
+        diseases = db.query(Sample.disease_term_pk).filter_by(submission_id=submission_id).distinct().all()
         disease_values = [d[0] for d in diseases]
         assert all(d is None for d in disease_values)
     finally:
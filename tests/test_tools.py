@@ -0,0 +1,146 @@
+"""
+Unit tests for the archive and result listing helpers of client/src/tools.py.
+Run: PYTHONPATH=$(pwd) pytest tests/test_tools.py
+"""
+import os
+import shutil
+import time
+import zipfile
+
+import pytest
+
+from client.src import tools
+
+
+@pytest.fixture
+def result_folder(tmp_path):
+    """
+    A small DNAvi result folder: already compressed images and text tables.
+    """
+    root = tmp_path / "result"
+    (root / "plots").mkdir(parents=True)
+    (root / "plots" / "lane.png").write_bytes(b"\x89PNG" + b"0" * 4096)
+    (root / "plots" / "UPPER.PNG").write_bytes(b"\x89PNG" + b"0" * 4096)
+    (root / "table.csv").write_text("a,b\n" + "1,2\n" * 1000)
+    (root / "empty.txt").write_text("")
+    return root
+
+
+def entries(archive_path):
+    with zipfile.ZipFile(archive_path) as zf:
+        assert zf.testzip() is None
+        return {info.filename: info.compress_type for info in zf.infolist()
+                if not info.is_dir()}
+
+
+def check_archive(archive_path, result_folder):
+    types = entries(archive_path)
+    assert set(types) == {"plots/lane.png", "plots/UPPER.PNG", "table.csv", "empty.txt"}
+    # Already compressed suffixes (either case) are stored, the rest deflated
+    assert types["plots/lane.png"] == zipfile.ZIP_STORED
+    assert types["plots/UPPER.PNG"] == zipfile.ZIP_STORED
+    assert types["table.csv"] == zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(archive_path) as zf:
+        assert zf.read("table.csv") == (result_folder / "table.csv").read_bytes()
+        assert zf.read("empty.txt") == b""
+
+
+def test_make_zip_archive(result_folder, tmp_path):
+    archive_path = tools.make_zip_archive(str(tmp_path / "archive"), str(result_folder))
+    assert archive_path == str(tmp_path / "archive.zip")
+    check_archive(archive_path, result_folder)
+
+
+@pytest.mark.skipif(shutil.which("zip") is None, reason="zip binary not installed")
+def test_zip_native(result_folder, tmp_path):
+    archive_path = str(tmp_path / "native.zip")
+    assert tools.zip_native(archive_path, str(result_folder))
+    check_archive(archive_path, result_folder)
+
+
+def test_zip_native_without_binary(result_folder, tmp_path, monkeypatch):
+    monkeypatch.setattr(tools.shutil, "which", lambda _: None)
+    assert not tools.zip_native(str(tmp_path / "native.zip"), str(result_folder))
+
+
+def test_make_zip_archive_zipfile_fallback(result_folder, tmp_path, monkeypatch):
+    monkeypatch.setattr(tools, "zip_native", lambda *args, **kwargs: False)
+    archive_path = tools.make_zip_archive(str(tmp_path / "fallback"), str(result_folder))
+    assert archive_path == str(tmp_path / "fallback.zip")
+    check_archive(archive_path, result_folder)
+
+
+def test_build_archive_renames_complete_archive(result_folder, tmp_path):
+    zip_path = str(tmp_path / "id_compressed")
+    assert tools.build_archive(zip_path, str(result_folder)) == f"{zip_path}.zip"
+    assert sorted(os.listdir(tmp_path)) == ["id_compressed.zip", "result"]
+    check_archive(f"{zip_path}.zip", result_folder)
+
+
+def test_build_archive_leaves_no_partial_file(result_folder, tmp_path, monkeypatch):
+    def failing_archive(base_name, root_dir):
+        with open(f"{base_name}.zip", "wb") as f:
+            f.write(b"PK")
+        raise OSError("disk full")
+    monkeypatch.setattr(tools, "make_zip_archive", failing_archive)
+    with pytest.raises(OSError):
+        tools.build_archive(str(tmp_path / "id_compressed"), str(result_folder))
+    assert os.listdir(tmp_path) == ["result"]
+
+
+def test_move_dnavi_files_archives_in_download_folder(result_folder, tmp_path):
+    upload_folder, download_folder = tmp_path / "uploads" / "user", tmp_path / "downloads" / "user"
+    upload_folder.mkdir(parents=True)
+    download_folder.mkdir(parents=True)
+    result_folder.rename(upload_folder / "id")
+    assert tools.move_dnavi_files("id", upload_folder=f"{upload_folder}/",
+                                  download_folder=f"{download_folder}/") == "id"
+    # The emptied upload folder of the user is removed right after the move
+    assert not upload_folder.exists()
+    archive_path = str(download_folder / "id_compressed.zip")
+    deadline = time.time() + 10
+    while tools.archive_pending(archive_path) and time.time() < deadline:
+        time.sleep(0.05)
+    assert sorted(os.listdir(download_folder)) == ["id", "id_compressed.zip"]
+    check_archive(archive_path, download_folder / "id")
+
+
+def test_claim_archive_is_exclusive(tmp_path):
+    archive_path = str(tmp_path / "id_compressed.zip")
+    assert not tools.archive_pending(archive_path)
+    assert tools.claim_archive(archive_path)
+    assert tools.archive_pending(archive_path)
+    assert not tools.claim_archive(archive_path)
+    tools.release_archive(archive_path)
+    assert not tools.archive_pending(archive_path)
+    assert tools.claim_archive(archive_path)
+
+
+def test_stale_claim_is_replaced(tmp_path):
+    archive_path = str(tmp_path / "id_compressed.zip")
+    assert tools.claim_archive(archive_path)
+    stale = time.time() - tools.ARCHIVE_STALE_AFTER - 1
+    os.utime(archive_path + tools.PENDING_SUFFIX, (stale, stale))
+    assert not tools.archive_pending(archive_path)
+    assert tools.claim_archive(archive_path)
+    assert tools.archive_pending(archive_path)
+
+
+def test_get_result_files_walks_nested_folders(tmp_path):
+    for relative_path in ("plots/peaks_1_sample.svg", "plots/deep/a/b/c/peaks_x_2_sample.svg",
+                          "qc/ladder.svg", "stats/basic_statistics.csv", "stats/peak_statistics.csv",
+                          "DNAviReport.pdf", "report/summary.html", "unrelated.svg"):
+        path = tmp_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x,y\n" + "1,2\n" * 10 if path.suffix == ".csv" else "")
+    statistics, peaks, other, pdfs, htmls = tools.get_result_files(str(tmp_path), "out")
+    join = os.path.join
+    assert sorted(peaks) == [join("out", "plots", "deep", "a", "b", "c", "peaks_x_2_sample.svg"),
+                             join("out", "plots", "peaks_1_sample.svg")]
+    assert other == [join("out", "qc", "ladder.svg")]
+    assert pdfs == [join("out", "DNAviReport.pdf")]
+    assert htmls == [join("out", "report", "summary.html")]
+    previews = {entry["name"]: entry for entry in statistics}
+    assert len(previews[join("out", "stats", "basic_statistics.csv")]["preview"]) == 10
+    assert len(previews[join("out", "stats", "peak_statistics.csv")]["preview"]) == 5
+    assert previews[join("out", "stats", "peak_statistics.csv")]["columns"] == ["x", "y"]
@@ -0,0 +1,31 @@
+"""
+Unit tests for the password hashing of UserDetails (no database needed).
+Run: PYTHONPATH=$(pwd) pytest tests/test_user_details.py
+"""
+from werkzeug.security import generate_password_hash
+
+from database.schema.user_details import UserDetails
+
+
+def test_new_passwords_use_argon2():
+    user = UserDetails(username="testuser")
+    user.set_password("testpassword")
+    assert user.password_hash.startswith("$argon2")
+    assert user.check_password("testpassword")
+    assert not user.check_password("wrongpassword")
+
+
+def test_legacy_werkzeug_hashes_still_accepted():
+    for method in ("pbkdf2:sha256", "scrypt"):
+        user = UserDetails(username="olduser", password_hash=generate_password_hash("oldpassword", method=method))
+        assert user.check_password("oldpassword")
+        assert not user.check_password("wrongpassword")
+
+
+def test_guest_without_password():
+    assert not UserDetails(username="guest_1234abcd").check_password("")
+
+
+def test_invalid_argon2_hash_is_rejected():
+    user = UserDetails(username="testuser", password_hash="$argon2id$broken")
+    assert not user.check_password("testpassword")
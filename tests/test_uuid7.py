@@ -0,0 +1,45 @@
+"""
+Unit tests for the UUIDv7 generator of the primary keys.
+Run: PYTHONPATH=$(pwd) pytest tests/test_uuid7.py
+"""
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from database.schema import uuid7 as uuid7_module
+from database.schema.uuid7 import uuid7
+
+
+def test_version_and_variant():
+    value = uuid7()
+    assert value.version == 7
+    # RFC 9562 variant: the two top bits of octet 8 are 0b10
+    assert (value.int >> 62) & 0x3 == 0x2
+
+
+def test_timestamp_prefix_is_unix_milliseconds():
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert before <= value.int >> 80 <= after
+
+
+def test_monotonic_within_the_same_millisecond():
+    values = [uuid7() for _ in range(10000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_monotonic_when_the_clock_goes_back(monkeypatch):
+    first = uuid7()
+    earlier = (first.int >> 80) - 1000
+    monkeypatch.setattr(uuid7_module.time, "time_ns", lambda: earlier * 1_000_000)
+    second = uuid7()
+    assert second > first
+    assert second.version == 7
+
+
+def test_unique_across_threads():
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        batches = list(executor.map(lambda _: [uuid7() for _ in range(2000)], range(8)))
+    values = [value for batch in batches for value in batch]
+    assert len(set(values)) == len(values)